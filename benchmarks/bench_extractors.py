@@ -0,0 +1,77 @@
+"""Micro-benchmark the single-pass extractor engine over the dataset notes.
+
+Runs every extraction the parsers do on a description (clock times, pain/fog
+rating, oz total, caffeine mg, supplement dose, max N/10 rating) once with the
+old one-regex-per-helper approach and once with text_extractor.tokenize, and
+reports microseconds per description.
+
+    python benchmarks/bench_extractors.py
+"""
+import glob
+import json
+import os
+import re
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from text_extractor import FOG, QUANTITY, RATING, clock_times, first_value, tokenize, values
+
+
+def load_descriptions():
+    """Every distinct Notes string in dataset/"""
+    notes = set()
+    for path in glob.glob(os.path.join(ROOT, "dataset", "migraine_log_*")):
+        with open(path, encoding="utf-8") as f:
+            for event in json.load(f)["TimelineEvents"]:
+                if event.get("Notes"):
+                    notes.add(event["Notes"])
+    return sorted(notes)
+
+
+def legacy(desc):
+    """The per-helper regexes as they were before the engine"""
+    lower = desc.lower()
+    times = re.findall(r'(\d{1,2})\s*[:：]\s*(\d{2})', desc)
+    rating = re.search(r'(\d+)\s*/\s*10', lower) or re.search(r'fog\s*(\d+)', lower)
+    oz = sum(int(v) for v in re.findall(r'(\d+)\s*oz', lower))
+    mg = re.search(r'(\d+)\s*mg', lower)
+    dose = re.search(r'(\d+(?:\.\d+)?)\s*(mg|g)', lower)
+    ratings = re.findall(r'(\d+)\s*/\s*10', desc)
+    unit = 'mg'
+    with_unit = re.search(rf'(\d+(?:\.\d+)?)\s*{unit}', desc, re.IGNORECASE)
+    return times, rating, oz, mg, dose, ratings, with_unit
+
+
+def engine(desc):
+    """The same answers from one tokenize() pass"""
+    spans = tokenize(desc)
+    times = clock_times(spans)
+    rating = first_value(spans, RATING) or first_value(spans, FOG)
+    oz = sum(values(spans, QUANTITY, ("oz",)))
+    mg = first_value(spans, QUANTITY, ("mg",))
+    dose = first_value(spans, QUANTITY, ("mg", "g"))
+    ratings = values(spans, RATING)
+    return times, rating, oz, mg, dose, ratings
+
+
+def main():
+    descriptions = load_descriptions()
+    repeat = 200
+
+    results = {}
+    for name, func in (("legacy", legacy), ("engine", engine)):
+        seconds = min(timeit.repeat(lambda: [func(d) for d in descriptions], number=repeat, repeat=5))
+        results[name] = seconds / (repeat * len(descriptions)) * 1e6
+
+    print(f"{len(descriptions)} descriptions, mean length "
+          f"{sum(map(len, descriptions)) / len(descriptions):.0f} chars")
+    for name, micros in results.items():
+        print(f"{name:>7}: {micros:7.2f} µs/description")
+    print(f"speedup: {results['legacy'] / results['engine']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""pytest-benchmark suite for the multi-day parser's hot paths and end-to-end ingest.
+
+Covers extract_time_from_text, categorize_event, parse_complex_sleep,
+segment_events on a long compound hydration cell, parse_sheet_data on a synthetic day sheet, and process_all_sheets over a
+synthetic journal from journal_generator. The file is not named test_*, so
+the default pytest run skips it; run it explicitly:
+
+    python -m pytest benchmarks/bench_pipeline.py --benchmark-storage=benchmarks/results --benchmark-save=baseline
+    python -m pytest benchmarks/bench_pipeline.py --benchmark-storage=benchmarks/results \
+        --benchmark-compare=0001 --benchmark-compare-fail=mean:25%
+"""
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+import multi_day_excel_parser as parser
+from benchmarks.journal_generator import generate_journal, write_workbook
+from extraction_cache import ExtractionCache
+
+JOURNAL_DAYS = 60
+ROWS_PER_DAY = 15
+
+SLEEP_TEXT = "In bed 21 : 40 (Unisom 12.5 mg) → asleep ~22 : 00 → woke 02 : 10 → up 05 : 30"
+
+# 200 timed items and a running total, as one cell
+HYDRATION_ITEMS = 200
+HYDRATION_TEXT = " ".join(f"{6 + i // 20:02d} : {i % 20 * 3:02d} Bottle #{i + 1} 16 oz (plain) finished ✔︎"
+                          for i in range(HYDRATION_ITEMS)) + " → Total fluids ≈ 3200 oz"
+
+
+@pytest.fixture(scope="module")
+def day_rows():
+    """One synthetic day as (Field, What happened) rows"""
+    _, rows = next(generate_journal(days=1, rows_per_day=ROWS_PER_DAY))
+    return rows
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory):
+    path = tmp_path_factory.mktemp("journal") / "journal.xlsx"
+    return str(write_workbook(str(path), days=JOURNAL_DAYS, rows_per_day=ROWS_PER_DAY))
+
+
+@pytest.fixture
+def no_extraction_cache(monkeypatch):
+    """Disable the per-row extraction cache so every row is extracted"""
+    monkeypatch.setattr(parser, "EXTRACTION_CACHE", ExtractionCache(maxsize=0))
+
+
+def test_extract_time_from_text(benchmark, day_rows):
+    descriptions = [description for _, description in day_rows]
+    benchmark(lambda: [parser.extract_time_from_text(text) for text in descriptions])
+
+
+def test_categorize_event(benchmark, day_rows):
+    benchmark(lambda: [parser.categorize_event(field, description) for field, description in day_rows])
+
+
+def test_parse_complex_sleep(benchmark):
+    events = benchmark(parser.parse_complex_sleep, SLEEP_TEXT, "2025-07-01")
+    assert len(events) == 4
+
+
+def test_segment_events(benchmark):
+    spans = parser.drop_running_totals(HYDRATION_TEXT, parser.tokenize(HYDRATION_TEXT))
+    events = benchmark(parser.segment_events, HYDRATION_TEXT, spans, "hydration", "water")
+    assert len(events) == HYDRATION_ITEMS
+    assert sum(event["Value"] for event in events) == 16 * HYDRATION_ITEMS
+
+
+def test_parse_sheet_data(benchmark, day_rows, no_extraction_cache):
+    df = pd.DataFrame(day_rows, columns=["Field", "What happened"])
+    daily_log = benchmark(parser.parse_sheet_data, "2025-07-01", df)
+    assert daily_log["TimelineEvents"]
+
+
+def test_process_all_sheets(benchmark, workbook, tmp_path, monkeypatch, no_extraction_cache):
+    # Outputs and the manifest are written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    benchmark.pedantic(parser.process_all_sheets, args=(workbook,),
+                       kwargs={"incremental": False, "cache_path": None}, rounds=3)
+    assert len(os.listdir(tmp_path / "dataset")) == JOURNAL_DAYS
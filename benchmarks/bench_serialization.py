@@ -0,0 +1,54 @@
+"""Benchmark JSON dump/load throughput over the dataset scaled up 1000x.
+
+Compares the historical stdlib indent=2 output with stdlib compact output and
+with whichever fast backend serialization.py picked (orjson or msgspec).
+
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --scale 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import serialization
+from event_store import load_daily_logs
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1000)
+    args = parser.parse_args()
+
+    logs = load_daily_logs(os.path.join(ROOT, "dataset")) * args.scale
+
+    modes = {
+        "json indent=2": (lambda obj: json.dumps(obj, indent=2, ensure_ascii=False), json.loads),
+        "json compact": (lambda obj: json.dumps(obj, ensure_ascii=False, separators=(',', ':')), json.loads),
+    }
+    if serialization.BACKEND != "json":
+        modes[f"{serialization.BACKEND} compact"] = (serialization.dumps_bytes, serialization.loads)
+        modes[f"{serialization.BACKEND} pretty"] = (
+            lambda obj: serialization.dumps_bytes(obj, pretty=True), serialization.loads)
+
+    print(f"{len(logs)} daily logs")
+    print(f"{'mode':>18} {'MB':>8} {'dump MB/s':>10} {'load MB/s':>10}")
+    for name, (dump, load) in modes.items():
+        dump_seconds, data = timed(dump, logs)
+        load_seconds, _ = timed(load, data)
+        size_mb = len(data.encode('utf-8') if isinstance(data, str) else data) / 1e6
+        print(f"{name:>18} {size_mb:>8.1f} {size_mb / dump_seconds:>10.1f} {size_mb / load_seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark peak memory of the pandas reader against the streaming reader.
+
+Builds synthetic journals with long notes at 30, 365 and 1500 day sheets and
+reads and parses every sheet once through pd.ExcelFile (one DataFrame per
+sheet) and once through sheet_rows.iter_workbook_sheets (openpyxl read-only,
+one sheet's rows at a time), reporting wall time and peak RSS. Each
+measurement runs in a fresh interpreter. Parsed logs are discarded and the
+extraction cache is disabled so only the reader's footprint grows with the
+workbook.
+
+    python benchmarks/bench_streaming_memory.py
+    python benchmarks/bench_streaming_memory.py --sheets 30 365 --note-length 1000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.journal_generator import write_workbook
+
+
+def read_and_parse(path, streaming):
+    """Parse every sheet of the workbook, keeping only a row count"""
+    import multi_day_excel_parser as parser
+    from extraction_cache import ExtractionCache
+
+    parser.EXTRACTION_CACHE = ExtractionCache(maxsize=0)
+    _, sheets = parser.read_workbook_sheets(path, streaming=streaming)
+    rows = 0
+    for sheet_name, sheet_rows in sheets:
+        parser.parse_sheet_rows(sheet_name, sheet_rows)
+        rows += len(sheet_rows)
+    return rows
+
+
+MODES = {
+    "excel_file": lambda path: read_and_parse(path, streaming=False),
+    "streaming": lambda path: read_and_parse(path, streaming=True),
+}
+
+
+def measure(mode, path):
+    """Run one mode in this process and print a JSON result line"""
+    import resource
+
+    # Imports are paid before the clock starts so both modes share them
+    import multi_day_excel_parser  # noqa: F401
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    rows = MODES[mode](path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"mode": mode, "rows": rows, "seconds": elapsed,
+                      "peak_rss_mb": peak_kb / 1024, "growth_mb": (peak_kb - baseline_kb) / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sheets", type=int, nargs="+", default=[30, 365, 1500])
+    parser.add_argument("--rows-per-day", type=int, default=15)
+    parser.add_argument("--note-length", type=int, default=400)
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    print(f"{'sheets':>7} {'mode':>12} {'seconds':>9} {'peak RSS MB':>12} {'growth MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.sheets:
+            path = os.path.join(tmp, f"journal_{count}.xlsx")
+            write_workbook(path, days=count, rows_per_day=args.rows_per_day, note_length=args.note_length)
+            for mode in MODES:
+                out = subprocess.run([sys.executable, __file__, "--measure", mode, path],
+                                     check=True, capture_output=True, text=True).stdout
+                result = json.loads(out.splitlines()[-1])
+                print(f"{count:>7} {mode:>12} {result['seconds']:>9.2f} "
+                      f"{result['peak_rss_mb']:>12.1f} {result['growth_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
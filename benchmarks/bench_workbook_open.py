@@ -0,0 +1,87 @@
+"""Benchmark single-open workbook ingestion against one read_excel per sheet.
+
+Builds synthetic journals with 30, 365 and 1500 day sheets and reports wall
+time and peak RSS of reading every sheet in each mode. Each measurement runs
+in a fresh interpreter so peak RSS is not polluted by earlier runs.
+
+    python benchmarks/bench_workbook_open.py
+    python benchmarks/bench_workbook_open.py --sheets 30 365 --legacy-limit 365
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.journal_generator import write_workbook
+
+
+def read_per_sheet(path):
+    """Legacy mode: re-open the workbook for every sheet"""
+    import pandas as pd
+
+    rows = 0
+    for sheet_name in pd.ExcelFile(path).sheet_names:
+        rows += len(pd.read_excel(path, sheet_name=sheet_name))
+    return rows
+
+
+def read_single_open(path):
+    """Open the workbook once and parse every sheet from that handle"""
+    import pandas as pd
+
+    rows = 0
+    with pd.ExcelFile(path) as xl_file:
+        for sheet_name in xl_file.sheet_names:
+            rows += len(xl_file.parse(sheet_name))
+    return rows
+
+
+MODES = {"per_sheet": read_per_sheet, "single_open": read_single_open}
+
+
+def measure(mode, path):
+    """Run one mode in this process and print a JSON result line"""
+    import resource
+
+    start = time.perf_counter()
+    rows = MODES[mode](path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"mode": mode, "rows": rows, "seconds": elapsed, "peak_rss_mb": peak_kb / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sheets", type=int, nargs="+", default=[30, 365, 1500])
+    parser.add_argument("--legacy-limit", type=int, default=365,
+                        help="skip the per-sheet mode above this many sheets (it is quadratic)")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    print(f"{'sheets':>7} {'mode':>12} {'seconds':>9} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.sheets:
+            path = os.path.join(tmp, f"journal_{count}.xlsx")
+            write_workbook(path, days=count)
+            for mode in MODES:
+                if mode == "per_sheet" and count > args.legacy_limit:
+                    print(f"{count:>7} {mode:>12} {'skipped':>9}")
+                    continue
+                out = subprocess.run([sys.executable, __file__, "--measure", mode, path],
+                                     check=True, capture_output=True, text=True).stdout
+                result = json.loads(out)
+                print(f"{count:>7} {mode:>12} {result['seconds']:>9.2f} {result['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
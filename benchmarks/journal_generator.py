@@ -0,0 +1,123 @@
+"""Synthetic multi-day journal workbooks for benchmarks.
+
+Rows are modeled on the Field / "What happened" text of the real journal and
+dataset/: spaced clock times ("07 : 05"), N/10 ratings, oz and mg quantities,
+bullet-separated supplement lists and compound sleep cells. Output is
+deterministic for a given seed.
+
+    python benchmarks/journal_generator.py journal.xlsx --days 365 --rows-per-day 15
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+# (Field, description template); {t} is a clock time, {r} a 0-10 rating
+TEMPLATES = [
+    ("Sleep", "In bed {t} (Unisom 12.5 mg) → asleep ~{t} → woke {t} → up {t}"),
+    ("Wake-up state", "Pain {r}/10, fog {r}; neck {mood}"),
+    ("Hydration", "{t} {oz} oz water + ½ pkt electrolytes ✔︎ {t} Bottle #1 {oz2} oz (plain) finished"),
+    ("Caffeine", "{coffee} (≈ {mg} mg) {t}"),
+    ("Breakfast", "{t} {breakfast}"),
+    ("Supplements", "{t} Riboflavin 400 mg • Mg glycinate 135 mg • Fish-oil #{n}"),
+    ("Body therapy", "{t} Contrast (heat {n} min → ice 2 min) on R-scap"),
+    ("Lunch", "{t} {lunch}"),
+    ("Stress / meeting", "{t} {meeting}, stress {r}"),
+    ("Pain check", "{t} pain {r}/10 {side}-sided, {quality}"),
+    ("Dinner", "{t} {dinner}"),
+    ("Walk", "{t} walk {n}0 min, {mood}"),
+    ("Medication", "{t} Ubrogepant 50 mg for {side} temple pressure"),
+    ("Evening status", "{t} head clear, fog {r}/10; patches still on"),
+    ("Bedtime", "{t} Unisom 12.5 mg"),
+]
+
+CHOICES = {
+    "mood": ["calm", "tight", "sore", "loose", "stiff"],
+    "coffee": ["Double-shot espresso + oat milk", "Pour-over coffee", "8-oz drip coffee", "Green-tea mug"],
+    "breakfast": ["Oatmeal + blueberries + egg", "Greek yogurt · blueberries · almonds · honey",
+                  "Toast + avocado + egg"],
+    "lunch": ["Grilled-salmon & arugula salad", "CAVA bowl (greens, chicken, hummus)", "Tofu stir-fry + rice"],
+    "dinner": ["Pasta dinner", "Fried chicken × 5 · celery sticks · ranch", "Salmon + rice + greens"],
+    "meeting": ["Mentor meeting", "1on1 with manager", "All-hands", "Design review"],
+    "side": ["right", "left"],
+    "quality": ["dull", "throbbing", "pressure", "sharp"],
+}
+
+FILLER = ("after lunch mild tension eased with patch hydration taper advised neck stretch "
+          "chin-tucks trapezius posture screen break electrolytes fatigue").split()
+
+
+def clock_time(rng, hour):
+    """A clock time near hour in the journal's spaced style, e.g. "07 : 05" """
+    return f"{min(hour + rng.randint(0, 1), 23):02d} : {rng.randrange(0, 60, 5):02d}"
+
+
+def fill(template, rng, hour):
+    """Fill one description template with random values, times starting near hour"""
+    parts = template.split("{t}")
+    text = parts[0] + "".join(clock_time(rng, hour) + part for part in parts[1:])
+    return text.format(
+        r=rng.randint(0, 10), oz=rng.choice([8, 12, 16]), oz2=rng.choice([30, 32]),
+        mg=rng.choice([70, 95, 120, 150]), n=rng.randint(1, 5),
+        **{key: rng.choice(values) for key, values in CHOICES.items()}
+    )
+
+
+def pad(text, note_length, rng):
+    """Extend a description with filler words to at least note_length characters"""
+    words = [text]
+    length = len(text)
+    while length < note_length:
+        word = rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def generate_rows(rows_per_day, note_length, rng):
+    """(Field, What happened) rows for one day"""
+    rows = []
+    for i in range(rows_per_day):
+        field, template = TEMPLATES[i % len(TEMPLATES)]
+        # Spread rows over 05:00-22:00 in template order, like a day's entries
+        hour = 5 + 17 * i // max(rows_per_day, 1)
+        rows.append((field, pad(fill(template, rng, hour), note_length, rng)))
+    return rows
+
+
+def generate_journal(days=30, rows_per_day=15, note_length=0, seed=0, start=date(2025, 7, 1)):
+    """Yield (sheet_name, rows) for each day, newest sheet first as in the real journal"""
+    rng = random.Random(seed)
+    for offset in range(days):
+        yield str(start - timedelta(days=offset)), generate_rows(rows_per_day, note_length, rng)
+
+
+def write_workbook(path, days=30, rows_per_day=15, note_length=0, seed=0):
+    """Write a synthetic journal with one sheet per day"""
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    for sheet_name, rows in generate_journal(days, rows_per_day, note_length, seed):
+        ws = wb.create_sheet(sheet_name)
+        ws.append(["Field", "What happened"])
+        for row in rows:
+            ws.append(list(row))
+    wb.save(path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--rows-per-day", type=int, default=15)
+    parser.add_argument("--note-length", type=int, default=0,
+                        help="pad descriptions with filler words to at least this many characters")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_workbook(args.path, args.days, args.rows_per_day, args.note_length, args.seed)
+    print(f"Wrote {args.days} day sheets to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import glob
+import os
+import re
+
+DATASET_DIR = "dataset"
+
+# Only canonical per-day files; one-off copies such as "_from_excel.json" or
+# extensionless files are left out.
+DAILY_LOG_RE = re.compile(r'migraine_log_(\d{4}-\d{2}-\d{2})\.json$')
+
+def daily_log_files(dataset_dir=DATASET_DIR):
+    """Paths of the canonical dataset/migraine_log_<date>.json files, oldest first"""
+    paths = [path for path in glob.glob(os.path.join(dataset_dir, "migraine_log_*"))
+             if DAILY_LOG_RE.search(os.path.basename(path))]
+    return sorted(paths)
+
+def daily_log_dates(dataset_dir=DATASET_DIR):
+    """Dates of the canonical daily log files, oldest first"""
+    return [DAILY_LOG_RE.search(os.path.basename(path)).group(1) for path in daily_log_files(dataset_dir)]
@@ -0,0 +1,188 @@
+import heapq
+
+# StressLevel placeholder for a summary that was not resumed from stored fields
+_UNSET = object()
+
+SUMMARY_KEYS = ("SleepWindow", "CaffeineMg", "HydrationOz", "StressLevel",
+                "Meals", "Medications", "PainEpisodes")
+
+def new_daily_log(date):
+    """Empty daily log in the system_prompt.md §5 schema"""
+    return {
+        "Date": date,
+        "TimelineEvents": [],
+        "SleepWindow": {"Bed": "", "Wake": ""},
+        "CaffeineMg": 0,
+        "HydrationOz": 0,
+        "StressLevel": None,
+        "StressNotes": "",
+        "Meals": [],
+        "Medications": [],
+        "PainEpisodes": [],
+        "Weather": {},
+        "Reflection": {
+            "Accomplishments": "",
+            "Bothering": "",
+            "TomorrowPlan": ""
+        },
+        "Notes": ""
+    }
+
+def time_part(event, default):
+    """HH:MM part of a TimelineEvent's time, or default if its Time has no time of day"""
+    if event.time_text is not None and "T" not in event.time_text:
+        return default
+    return event.hhmm
+
+def notes_of(event):
+    """An event's Notes, "" when absent"""
+    return "" if event.notes is None else event.notes
+
+def pain_episode(event):
+    """Default PainEpisodes entry for a rated pain event"""
+    return {
+        "Start": event.time,
+        "Peak": event.time,
+        "End": None,
+        "Location": "General",
+        "Intensity": [event.value],
+        "Notes": notes_of(event)
+    }
+
+class DaySummary:
+    """Streaming reducer for a daily log's summary fields.
+
+    Feed TimelineEvents one at a time with add(); running sums, the stress
+    median (two heaps), the Meals/Medications/PainEpisodes lists and the
+    SleepWindow are updated per event, so the summary is current mid-day
+    without re-scanning the timeline.
+    """
+
+    def __init__(self, pain_episode=pain_episode):
+        self.pain_episode = pain_episode
+        self.event_count = 0
+        self.caffeine_mg = 0
+        self.hydration_oz = 0
+        self.meals = []
+        self.medications = []
+        self.pain_episodes = []
+        self.sleep_window = {"Bed": "", "Wake": ""}
+        # Max-heap (negated) of the lower half and min-heap of the upper half
+        self._stress_low = []
+        self._stress_high = []
+        self._stored_stress = _UNSET
+
+    def resume(self, daily_log, events):
+        """Continue from a stored daily log's summary fields instead of its events.
+
+        Totals, lists and the SleepWindow start from the stored (possibly
+        hand-curated) values, so later add() calls only fold in new events.
+        The stored StressLevel is kept until a new stress rating arrives; the
+        day's existing events seed the median so it stays correct from then on.
+        """
+        self.event_count = len(events)
+        self.caffeine_mg = daily_log.get("CaffeineMg") or 0
+        self.hydration_oz = daily_log.get("HydrationOz") or 0
+        self.meals = list(daily_log.get("Meals") or [])
+        self.medications = list(daily_log.get("Medications") or [])
+        self.pain_episodes = list(daily_log.get("PainEpisodes") or [])
+        self.sleep_window = dict(daily_log.get("SleepWindow") or {"Bed": "", "Wake": ""})
+        for event in events:
+            if event.type == "stress" and event.value is not None:
+                self._add_stress(event.value)
+        self._stored_stress = daily_log.get("StressLevel")
+        return self
+
+    def add(self, event):
+        """Fold one TimelineEvent (an event_model.TimelineEvent) into the summary"""
+        self.event_count += 1
+        event_type = event.type
+
+        if event_type == "caffeine" and event.value is not None:
+            self.caffeine_mg += event.value
+        elif event_type == "hydration" and event.value is not None:
+            self.hydration_oz += event.value
+        elif event_type == "stress" and event.value is not None:
+            self._add_stress(event.value)
+            self._stored_stress = _UNSET
+        elif event_type == "meal":
+            self.meals.append({
+                "Time": time_part(event, "12:00"),
+                "Skipped": False,
+                "Notes": notes_of(event)
+            })
+        elif event_type == "med":
+            dose_str = f"{'' if event.value is None else event.value} {event.units or ''}".strip()
+            self.medications.append({
+                "Time": time_part(event, "12:00"),
+                "Name": event.subtype,
+                "Dose": dose_str if dose_str else event.subtype
+            })
+        elif event_type == "supplement" and "unisom" in notes_of(event).lower():
+            self.medications.append({
+                "Time": time_part(event, "22:00"),
+                "Name": "Unisom",
+                "Dose": "12.5 mg"
+            })
+        elif event_type == "pain" and event.value is not None:
+            self.pain_episodes.append(self.pain_episode(event))
+        elif event_type == "sleep_note":
+            subtype = event.subtype or ""
+            if "bedtime" in subtype or "bed" in notes_of(event).lower():
+                self.sleep_window["Bed"] = time_part(event, "22:00")
+            elif "wake" in subtype or "wake" in notes_of(event).lower():
+                self.sleep_window["Wake"] = time_part(event, "06:00")
+
+    def _add_stress(self, value):
+        if self._stress_low and value > -self._stress_low[0]:
+            heapq.heappush(self._stress_high, value)
+        else:
+            heapq.heappush(self._stress_low, -value)
+        # Rebalance so the lower half holds the extra element
+        if len(self._stress_low) > len(self._stress_high) + 1:
+            heapq.heappush(self._stress_high, -heapq.heappop(self._stress_low))
+        elif len(self._stress_high) > len(self._stress_low):
+            heapq.heappush(self._stress_low, -heapq.heappop(self._stress_high))
+
+    @property
+    def stress_level(self):
+        """Median of the day's rated stress events, or None"""
+        if self._stored_stress is not _UNSET:
+            return self._stored_stress
+        if not self._stress_low:
+            return None
+        if len(self._stress_low) > len(self._stress_high):
+            return int(-self._stress_low[0])
+        return int((-self._stress_low[0] + self._stress_high[0]) / 2)
+
+    def fields(self):
+        """Summary fields keyed as in the daily log schema"""
+        return {
+            "SleepWindow": self.sleep_window,
+            "CaffeineMg": self.caffeine_mg,
+            "HydrationOz": self.hydration_oz,
+            "StressLevel": self.stress_level,
+            "Meals": self.meals,
+            "Medications": self.medications,
+            "PainEpisodes": self.pain_episodes,
+        }
+
+    def apply_to(self, daily_log, keys=SUMMARY_KEYS):
+        """Write the summary fields (or a subset) into a daily log dict"""
+        fields = self.fields()
+        for key in keys:
+            daily_log[key] = fields[key]
+        return daily_log
+
+    def quick_stats(self):
+        """Counts and totals for a live status line"""
+        return {
+            "Events": self.event_count,
+            "CaffeineMg": self.caffeine_mg,
+            "HydrationOz": self.hydration_oz,
+            "StressLevel": self.stress_level,
+            "Meals": len(self.meals),
+            "Medications": len(self.medications),
+            "PainEpisodes": len(self.pain_episodes),
+            "SleepWindow": dict(self.sleep_window),
+        }
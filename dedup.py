@@ -0,0 +1,160 @@
+import glob
+import os
+import re
+from copy import copy
+
+from dataset_files import DATASET_DIR
+from event_model import DailyLog, EventType
+from serialization import dump_file, load_file
+
+# Events whose times fall in the same bucket of this many minutes can match
+DEDUP_BUCKET_MINUTES = 5
+
+# The parsers stamp rows without a clock time at noon, so two such events say
+# nothing about when they happened and only exact copies are merged
+UNTIMED_MINUTE = 12 * 60
+
+# Free-text Types whose Type/Subtype/Value carry too little to identify an event
+EXEMPT_TYPES = frozenset({EventType.NOTE})
+
+NOTES_SEPARATOR = "; "
+
+# Every file one day can be spread over, in the order they win conflicts:
+# the canonical .json, the extensionless hand-written copy, then the
+# Excel-derived _from_excel.json
+_DAY_FILE_RE = re.compile(r'migraine_log_(\d{4}-\d{2}-\d{2})(\.json|_from_excel\.json|)$')
+_SOURCE_PRIORITY = {".json": 0, "": 1, "_from_excel.json": 2}
+
+_EMPTY = (None, "", [], {})
+
+def normalize_value(value):
+    """Value as a rounded float when numeric, else a stripped lower-case string"""
+    if value is None or isinstance(value, bool):
+        return value
+    try:
+        return round(float(value), 3)
+    except (TypeError, ValueError):
+        return str(value).strip().lower()
+
+def fingerprint(event, bucket_minutes=DEDUP_BUCKET_MINUTES):
+    """(time bucket, Type, Subtype, normalized Value) of a TimelineEvent"""
+    bucket = event.time_text if event.time_text is not None else event.minute // bucket_minutes
+    return bucket, event.type, event.subtype, normalize_value(event.value)
+
+def is_exempt(event):
+    """True for events that only merge with exact copies of themselves"""
+    return event.type in EXEMPT_TYPES or (event.time_text is None and event.minute % 1440 == UNTIMED_MINUTE)
+
+def _has_notes(notes):
+    return notes is not None and str(notes).strip() not in ("", "nan")
+
+def _normalize_notes(notes):
+    return " ".join(str(notes).lower().split()).rstrip(".") if _has_notes(notes) else ""
+
+def exact_fingerprint(event):
+    """Time, Type, Subtype, normalized Value and normalized Notes, for exempt events"""
+    return (event.minute, event.time_text, event.type, event.subtype, normalize_value(event.value),
+            _normalize_notes(event.notes))
+
+def merge_into(kept, duplicate):
+    """Fold a duplicate into the event kept in its place.
+
+    The kept event's fields win; Notes from the duplicate are added unless
+    they are already part of the kept Notes, a missing Value (with its
+    Units) is taken from the duplicate, and any other keys it lacks are
+    copied over.
+    """
+    if _has_notes(duplicate.notes):
+        kept_notes = _normalize_notes(kept.notes)
+        new_notes = _normalize_notes(duplicate.notes)
+        if not kept_notes or kept_notes in new_notes:
+            kept.notes = duplicate.notes
+        elif new_notes not in kept_notes:
+            kept.notes = f"{kept.notes}{NOTES_SEPARATOR}{duplicate.notes}"
+
+    if kept.value is None and duplicate.value is not None:
+        kept.value = duplicate.value
+        if duplicate.units is not None:
+            kept.units = duplicate.units
+
+    if duplicate.extra:
+        kept.extra = {**duplicate.extra, **(kept.extra or {})}
+
+def merge_duplicates(events, bucket_minutes=DEDUP_BUCKET_MINUTES, exempt=is_exempt, groups=None):
+    """Merge TimelineEvents with equal fingerprints in one pass over the list.
+
+    The first event of each fingerprint is kept in its position (as a copy)
+    and later ones are folded into it with merge_into, so the result depends
+    only on the input order. Exempt events only merge with exact copies of
+    themselves. groups optionally gives each event a group (e.g. the row it
+    came from): the k-th event with a fingerprint in one group can only
+    merge with the k-th in another, so a group's own events stay apart.
+    Returns (events, number of events merged away).
+    """
+    merged = []
+    first = {}
+    occurrences = {}
+    for i, event in enumerate(events):
+        key = exact_fingerprint(event) if exempt(event) else fingerprint(event, bucket_minutes)
+        if groups is not None:
+            occurrence = occurrences[groups[i], key] = occurrences.get((groups[i], key), -1) + 1
+            key = key, occurrence
+        kept = first.get(key)
+        if kept is None:
+            first[key] = kept = copy(event)
+            merged.append(kept)
+        else:
+            merge_into(kept, event)
+    return merged, len(events) - len(merged)
+
+def day_files(dataset_dir=DATASET_DIR):
+    """{date: [paths]} for every daily log file in dataset/, highest priority first"""
+    days = {}
+    for path in glob.glob(os.path.join(dataset_dir, "migraine_log_*")):
+        match = _DAY_FILE_RE.search(os.path.basename(path))
+        if match:
+            days.setdefault(match.group(1), []).append((_SOURCE_PRIORITY[match.group(2)], path))
+    return {date: [path for _, path in sorted(paths)] for date, paths in sorted(days.items())}
+
+def consolidate_day(daily_logs, bucket_minutes=DEDUP_BUCKET_MINUTES):
+    """Merge several copies of one day (highest priority first) into one daily log.
+
+    Summary fields come from the first copy that has them filled in; the
+    copies' events are concatenated in priority order and merged with
+    merge_duplicates, so the higher-priority copy wins every conflict.
+    """
+    consolidated = {"Date": daily_logs[0]["Date"], "TimelineEvents": []}
+    for daily_log in daily_logs:
+        for key, value in daily_log.items():
+            if key == "TimelineEvents":
+                continue
+            if key not in consolidated or (consolidated[key] in _EMPTY and value not in _EMPTY):
+                consolidated[key] = value
+
+    events = [event for daily_log in daily_logs for event in DailyLog.from_dict(daily_log).events]
+    events, _ = merge_duplicates(events, bucket_minutes)
+
+    # Stable, so events at the same time keep the priority order
+    events.sort(key=lambda event: event.minute)
+    consolidated["TimelineEvents"] = [event.to_dict() for event in events]
+    return consolidated
+
+def consolidate_dataset(dataset_dir=DATASET_DIR, output_dir=None, pretty=False,
+                        bucket_minutes=DEDUP_BUCKET_MINUTES):
+    """Merge every date spread over several files into its canonical migraine_log_<date>.json.
+
+    The other copies are left in place. Returns {date: (paths merged, events
+    before, events after)} for the dates that had more than one file.
+    """
+    output_dir = output_dir or dataset_dir
+    os.makedirs(output_dir, exist_ok=True)
+    report = {}
+    for date, paths in day_files(dataset_dir).items():
+        if len(paths) < 2:
+            continue
+        daily_logs = [load_file(path) for path in paths]
+        consolidated = consolidate_day(daily_logs, bucket_minutes)
+        dump_file(consolidated, os.path.join(output_dir, f"migraine_log_{date}.json"), pretty=pretty)
+        before = sum(len(daily_log.get("TimelineEvents", [])) for daily_log in daily_logs)
+        report[date] = (paths, before, len(consolidated["TimelineEvents"]))
+    return report
@@ -0,0 +1,121 @@
+from collections import deque
+
+# Declarative keyword → (Type, Subtype) table shared by both parsers. Entries
+# are in priority order: when a field contains several keywords, the one
+# listed first wins (so "Wake-up state" is a wake note, not a pain update,
+# and "Stress / meeting" is a meeting). New categories are new rows here;
+# matching cost does not grow with the number of rows.
+EVENT_KEYWORDS = [
+    # Sleep-related fields
+    ("sleep", "sleep_note", "general"),
+    ("wake", "sleep_note", "wake"),
+    ("bedtime", "sleep_note", "bedtime"),
+    
+    # Pain/fog related
+    ("pain", "pain", "status_update"),
+    ("fog", "pain", "status_update"),
+    
+    # Hydration
+    ("hydration", "hydration", "water"),
+    ("bottle", "hydration", "water"),
+    
+    # Meals
+    ("breakfast", "meal", "breakfast"),
+    ("lunch", "meal", "lunch"),
+    ("dinner", "meal", "dinner"),
+    ("meal", "meal", "dinner"),
+    ("snack", "meal", "dinner"),
+    
+    # Supplements/medications
+    ("supplement", "supplement", "general"),
+    ("medication", "supplement", "general"),
+    ("med", "supplement", "general"),
+    
+    # Exercise/therapy
+    ("exercise", "bodycare", "therapy"),
+    ("therapy", "bodycare", "therapy"),
+    ("care", "bodycare", "therapy"),
+    ("stretch", "bodycare", "therapy"),
+    
+    # Caffeine/coffee
+    ("caffeine", "caffeine", "coffee"),
+    ("coffee", "caffeine", "coffee"),
+    
+    # Stress/meetings
+    ("meeting", "stress", "meeting"),
+    ("stress", "stress", "general"),
+    ("work", "stress", "general"),
+    ("anxiety", "stress", "general"),
+    
+    # Activity/entertainment
+    ("movie", "activity", "movie"),
+    ("activity", "activity", "general"),
+    ("entertainment", "activity", "general"),
+]
+
+class KeywordClassifier:
+    """Aho–Corasick matcher mapping text to the highest-priority keyword's category"""
+    
+    def __init__(self, table):
+        self.categories = [(event_type, subtype) for _, event_type, subtype in table]
+        
+        # Trie over the keywords; best[node] is the lowest table index of any
+        # keyword ending at this node or at a node on its failure chain.
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]
+        
+        for priority, (keyword, _, _) in enumerate(table):
+            node = 0
+            for char in keyword.lower():
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            if self._best[node] is None or priority < self._best[node]:
+                self._best[node] = priority
+        
+        # Breadth-first pass to fill in failure links (depth-1 nodes fail to the root)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+    
+    def classify(self, text):
+        """Return (Type, Subtype) for lowercased text, or None if no keyword occurs"""
+        goto, fail, best = self._goto, self._fail, self._best
+        node = 0
+        found = None
+        
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            priority = best[node]
+            if priority is not None and (found is None or priority < found):
+                found = priority
+                if found == 0:
+                    break
+        
+        return None if found is None else self.categories[found]
+
+EVENT_CLASSIFIER = KeywordClassifier(EVENT_KEYWORDS)
+
+def classify_field(field_str):
+    """Classify a field name into (Type, Subtype), or None for a generic note"""
+    return EVENT_CLASSIFIER.classify(field_str.lower())
+
+def field_categories(field_str):
+    """Every (Type, Subtype) whose keyword occurs in a field name, in priority order"""
+    field_lower = field_str.lower()
+    return [(event_type, subtype) for keyword, event_type, subtype in EVENT_KEYWORDS if keyword in field_lower]
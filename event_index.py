@@ -0,0 +1,68 @@
+import numpy as np
+
+# The trigger analysis in system_prompt.md looks at what happened in the hours
+# before each pain onset.
+PRECURSOR_TYPES = ("caffeine", "hydration", "stress")
+
+class EventIndex:
+    """Sorted timestamp and Type→positions indexes over an EventStore.
+
+    Range and window lookups are binary searches (np.searchsorted) over the
+    sorted minute timestamps, and per-Type prefix sums of Value turn "total
+    in a window" into two lookups, so precursor windows for every pain event
+    cost O((pains + events) log events) rather than pains × events.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.minutes = store.time.astype(np.int64)
+
+        # Positions (into the store) of each Type, already in time order
+        self.positions = {
+            name: np.flatnonzero(store.type == code)
+            for code, name in enumerate(store.type_names)
+        }
+        self._type_minutes = {name: self.minutes[rows] for name, rows in self.positions.items()}
+        self._type_prefix = {
+            name: np.concatenate(([0.0], np.cumsum(np.nan_to_num(store.value[rows]))))
+            for name, rows in self.positions.items()
+        }
+
+    def _minute(self, when):
+        return np.datetime64(when, "m").astype(np.int64)
+
+    def range(self, start, end, type=None):
+        """Store positions of events in [start, end), optionally of one Type"""
+        if type is None:
+            lo, hi = np.searchsorted(self.minutes, [self._minute(start), self._minute(end)])
+            return np.arange(lo, hi)
+        if type not in self.positions:
+            return np.empty(0, dtype=np.int64)
+        lo, hi = np.searchsorted(self._type_minutes[type], [self._minute(start), self._minute(end)])
+        return self.positions[type][lo:hi]
+
+    def windows(self, ends, hours, type):
+        """(lo, hi) bounds into a Type's positions for the windows [end - hours, end)"""
+        ends = np.asarray(ends, dtype=np.int64)
+        minutes = self._type_minutes.get(type, np.empty(0, dtype=np.int64))
+        lo = np.searchsorted(minutes, ends - int(hours * 60), side="left")
+        hi = np.searchsorted(minutes, ends, side="left")
+        return lo, hi
+
+    def precursors(self, target="pain", hours=6, types=PRECURSOR_TYPES):
+        """Count and total Value of each precursor Type in the window before every target event.
+
+        Returns a dict with "time" (datetime64 onsets of the target events) and,
+        per precursor Type, "<type>_count" and "<type>_total" arrays aligned
+        with it.
+        """
+        onsets = self._type_minutes.get(target, np.empty(0, dtype=np.int64))
+        result = {"time": onsets.astype("datetime64[m]")}
+
+        for type in types:
+            lo, hi = self.windows(onsets, hours, type)
+            prefix = self._type_prefix.get(type, np.zeros(1))
+            result[f"{type}_count"] = hi - lo
+            result[f"{type}_total"] = prefix[hi] - prefix[lo]
+
+        return result
@@ -0,0 +1,159 @@
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from enum import Enum
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+class EventType(str, Enum):
+    """TimelineEvent Types from system_prompt.md §2a plus those the parsers emit"""
+    CAFFEINE = "caffeine"
+    HYDRATION = "hydration"
+    STRESS = "stress"
+    MOOD = "mood"
+    MEAL = "meal"
+    PAIN = "pain"
+    MED = "med"
+    SUPPLEMENT = "supplement"
+    BODYCARE = "bodycare"
+    ACTIVITY = "activity"
+    SLEEP_NOTE = "sleep_note"
+    NOTE = "note"
+
+    def __str__(self):
+        return self.value
+
+_EVENT_TYPES = {member.value: member for member in EventType}
+
+def parse_minute(time_str):
+    """Minutes since 1970-01-01 for "YYYY-MM-DDTHH:MM", or None for any other format"""
+    if len(time_str) != 16 or time_str[10] != "T" or time_str[13] != ":":
+        return None
+    try:
+        day = date(int(time_str[0:4]), int(time_str[5:7]), int(time_str[8:10]))
+        hour, minute = int(time_str[11:13]), int(time_str[14:16])
+    except ValueError:
+        return None
+    if hour > 23 or minute > 59:
+        return None
+    return (day.toordinal() - _EPOCH_ORDINAL) * 1440 + hour * 60 + minute
+
+def parse_clock(time_str):
+    """Minutes into the day for the HH:MM after the last "T" of a Time (or the whole Time), or 0.
+
+    Used to order Times that parse_minute rejects, such as "Sheet1T18:30"
+    from a sheet not named as a date, by their time of day.
+    """
+    hours, _, minutes = time_str.rpartition("T")[2].partition(":")
+    try:
+        hour, minute = int(hours), int(minutes[:2])
+    except ValueError:
+        return 0
+    return hour * 60 + minute if 0 <= hour <= 23 and 0 <= minute <= 59 else 0
+
+def format_minute(minute):
+    """Inverse of parse_minute"""
+    day = date.fromordinal(minute // 1440 + _EPOCH_ORDINAL)
+    return f"{day.isoformat()}T{minute // 60 % 24:02d}:{minute % 60:02d}"
+
+@dataclass(slots=True)
+class TimelineEvent:
+    """One TimelineEvent with a pre-parsed timestamp.
+
+    minute is minutes since 1970-01-01 in local time, so sorting and
+    bucketing are integer operations. A Time in any other format is kept in
+    time_text and its minute is only the time of day, so it still sorts by
+    time. type is an EventType (or the interned string for a Type outside
+    the enum) and subtype is interned, so repeated values share one object.
+    None means the key is absent from the JSON.
+    """
+    minute: int
+    type: object
+    subtype: str
+    value: object = None
+    units: str = None
+    notes: str = None
+    time_text: str = None   # original Time when it is not "YYYY-MM-DDTHH:MM"
+    extra: dict = None      # keys outside the schema, kept for round-tripping
+
+    @classmethod
+    def create(cls, time_str, type_name, subtype=None, notes=None, value=None, units=None, extra=None):
+        """Build from schema field values, parsing the Time and interning Type/Subtype/Units"""
+        minute = parse_minute(time_str)
+        return cls(
+            minute=minute if minute is not None else parse_clock(time_str),
+            type=_EVENT_TYPES.get(type_name) or sys.intern(type_name),
+            subtype=sys.intern(subtype) if subtype is not None else None,
+            value=value,
+            units=sys.intern(units) if units is not None else None,
+            notes=notes,
+            time_text=None if minute is not None else time_str,
+            extra=extra or None,
+        )
+
+    @classmethod
+    def from_dict(cls, event):
+        """Build from a TimelineEvent dict in the system_prompt.md §5 schema"""
+        extra = {key: value for key, value in event.items() if key not in _EVENT_KEYS}
+        return cls.create(event["Time"], event["Type"], event.get("Subtype"), event.get("Notes"),
+                          event.get("Value"), event.get("Units"), extra)
+
+    def to_dict(self):
+        """TimelineEvent dict in the §5 schema (absent fields stay absent)"""
+        event = {"Time": self.time, "Type": str(self.type)}
+        if self.subtype is not None:
+            event["Subtype"] = self.subtype
+        if self.notes is not None:
+            event["Notes"] = self.notes
+        if self.value is not None:
+            event["Value"] = self.value
+        if self.units is not None:
+            event["Units"] = self.units
+        if self.extra:
+            event.update(self.extra)
+        return event
+
+    @property
+    def time(self):
+        """ISO-8601 local Time string"""
+        return self.time_text if self.time_text is not None else format_minute(self.minute)
+
+    @property
+    def hhmm(self):
+        """HH:MM part of the time, as used by the Meals/Medications/SleepWindow summaries"""
+        if self.time_text is not None:
+            return self.time_text.split("T")[1] if "T" in self.time_text else self.time_text
+        return f"{self.minute // 60 % 24:02d}:{self.minute % 60:02d}"
+
+_EVENT_KEYS = {"Time", "Type", "Subtype", "Value", "Units", "Notes"}
+
+@dataclass(slots=True)
+class DailyLog:
+    """A daily log: typed TimelineEvents plus the remaining §5 fields as loaded.
+
+    fields keeps every other key (SleepWindow, CaffeineMg, ..., Notes) in its
+    original order so to_dict() reproduces the input exactly.
+    """
+    date: str
+    events: list = field(default_factory=list)
+    fields: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, daily_log):
+        """Build from a daily log dict"""
+        return cls(
+            date=daily_log["Date"],
+            events=[TimelineEvent.from_dict(event) for event in daily_log.get("TimelineEvents", [])],
+            fields={key: value for key, value in daily_log.items()
+                    if key not in ("Date", "TimelineEvents")},
+        )
+
+    def to_dict(self):
+        """Daily log dict in the §5 schema"""
+        daily_log = {"Date": self.date, "TimelineEvents": [event.to_dict() for event in self.events]}
+        daily_log.update(self.fields)
+        return daily_log
+
+    def sort(self):
+        """Sort events by time (stable, integer keys)"""
+        self.events.sort(key=lambda event: event.minute)
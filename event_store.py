@@ -0,0 +1,189 @@
+import os
+
+import numpy as np
+
+from dataset_files import DAILY_LOG_RE, DATASET_DIR, daily_log_files
+from serialization import load_file
+
+STORE_PATH = ".ingest_cache/events.npz"
+
+def load_daily_logs(dataset_dir=DATASET_DIR):
+    """Load every canonical daily log in dataset/"""
+    logs = []
+    for path in daily_log_files(dataset_dir):
+        logs.append(load_file(path))
+    return logs
+
+class _Interner:
+    """Assigns a stable integer code to each distinct string"""
+
+    def __init__(self, names=()):
+        self.names = list(names)
+        self.codes = {name: code for code, name in enumerate(self.names)}
+
+    def code(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+class EventStore:
+    """Columnar store of TimelineEvents: one typed NumPy array per field.
+
+    Time is datetime64[m]; Type, Subtype, Units and Notes are integer codes
+    into shared name tables (so every distinct string is stored once); Value
+    is float64 with NaN where the event has no value. Rows are kept sorted by
+    time.
+    """
+
+    COLUMNS = ("time", "type", "subtype", "value", "units", "notes")
+
+    def __init__(self, time, type, subtype, value, units, notes,
+                 type_names, subtype_names, unit_names, note_names):
+        self.time = time
+        self.type = type
+        self.subtype = subtype
+        self.value = value
+        self.units = units
+        self.notes = notes
+        self.type_names = type_names
+        self.subtype_names = subtype_names
+        self.unit_names = unit_names
+        self.note_names = note_names
+
+    @classmethod
+    def from_daily_logs(cls, logs):
+        """Build a store from daily log dicts"""
+        types, subtypes, units, notes = _Interner(), _Interner(), _Interner([""]), _Interner([""])
+        times, type_codes, subtype_codes, values, unit_codes, note_codes = [], [], [], [], [], []
+
+        for daily_log in logs:
+            for event in daily_log.get("TimelineEvents", []):
+                times.append(event["Time"])
+                type_codes.append(types.code(event["Type"]))
+                subtype_codes.append(subtypes.code(event.get("Subtype", "")))
+                value = event.get("Value")
+                values.append(value if isinstance(value, (int, float)) else np.nan)
+                unit_codes.append(units.code(event.get("Units") or ""))
+                note_codes.append(notes.code(event.get("Notes") or ""))
+
+        time = np.array(times, dtype="datetime64[m]")
+        order = np.argsort(time, kind="stable")
+
+        return cls(
+            time[order],
+            np.array(type_codes, dtype=np.int16)[order],
+            np.array(subtype_codes, dtype=np.int32)[order],
+            np.array(values, dtype=np.float64)[order],
+            np.array(unit_codes, dtype=np.int16)[order],
+            np.array(note_codes, dtype=np.int32)[order],
+            types.names, subtypes.names, units.names, notes.names,
+        )
+
+    @classmethod
+    def from_dataset(cls, dataset_dir=DATASET_DIR):
+        """Build a store from every canonical daily log in dataset/"""
+        return cls.from_daily_logs(load_daily_logs(dataset_dir))
+
+    def save(self, path):
+        """Write the store to a single .npz file"""
+        np.savez_compressed(
+            path,
+            **{column: getattr(self, column) for column in self.COLUMNS},
+            type_names=np.array(self.type_names, dtype=object),
+            subtype_names=np.array(self.subtype_names, dtype=object),
+            unit_names=np.array(self.unit_names, dtype=object),
+            note_names=np.array(self.note_names, dtype=object),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Read a store written by save()"""
+        with np.load(path, allow_pickle=True) as data:
+            return cls(
+                *(data[column] for column in cls.COLUMNS),
+                data["type_names"].tolist(), data["subtype_names"].tolist(),
+                data["unit_names"].tolist(), data["note_names"].tolist(),
+            )
+
+    def __len__(self):
+        return len(self.time)
+
+    def _code(self, names, name):
+        try:
+            return names.index(name)
+        except ValueError:
+            return -1
+
+    def mask(self, start=None, end=None, type=None, subtype=None):
+        """Boolean row mask for a time range [start, end) and optional Type/Subtype"""
+        keep = np.ones(len(self), dtype=bool)
+        if start is not None:
+            keep &= self.time >= np.datetime64(start, "m")
+        if end is not None:
+            keep &= self.time < np.datetime64(end, "m")
+        if type is not None:
+            keep &= self.type == self._code(self.type_names, type)
+        if subtype is not None:
+            keep &= self.subtype == self._code(self.subtype_names, subtype)
+        return keep
+
+    def select(self, start=None, end=None, type=None, subtype=None):
+        """Sub-store of the rows matching mask()"""
+        return self.take(self.mask(start, end, type, subtype))
+
+    def take(self, rows):
+        """Sub-store of the given rows (mask or positions), sharing the name tables"""
+        return EventStore(
+            *(getattr(self, column)[rows] for column in self.COLUMNS),
+            self.type_names, self.subtype_names, self.unit_names, self.note_names,
+        )
+
+    def daily_total(self, type, units=None, start=None, end=None):
+        """Sum of Value per day for one Type, e.g. caffeine mg per day -> (dates, totals)"""
+        keep = self.mask(start, end, type) & ~np.isnan(self.value)
+        if units is not None:
+            keep &= self.units == self._code(self.unit_names, units)
+        days = self.time[keep].astype("datetime64[D]")
+        dates, inverse = np.unique(days, return_inverse=True)
+        return dates, np.bincount(inverse, weights=self.value[keep], minlength=len(dates))
+
+    def by_hour(self, type, reducer="mean", start=None, end=None):
+        """Value aggregated by hour of day (0-23) for one Type, e.g. pain by hour"""
+        keep = self.mask(start, end, type) & ~np.isnan(self.value)
+        hours = (self.time[keep] - self.time[keep].astype("datetime64[D]")).astype(int) // 60
+        totals = np.bincount(hours, weights=self.value[keep], minlength=24)
+        if reducer == "sum":
+            return totals
+        counts = np.bincount(hours, minlength=24)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return totals / counts
+
+    def records(self):
+        """Rows back as TimelineEvent dicts (Value/Units only where present)"""
+        for i in range(len(self)):
+            event = {
+                "Time": str(self.time[i]),
+                "Type": self.type_names[self.type[i]],
+                "Subtype": self.subtype_names[self.subtype[i]],
+            }
+            if not np.isnan(self.value[i]):
+                value = float(self.value[i])
+                event["Value"] = int(value) if value.is_integer() else value
+                event["Units"] = self.unit_names[self.units[i]]
+            event["Notes"] = self.note_names[self.notes[i]]
+            yield event
+
+def open_store(path=STORE_PATH, dataset_dir=DATASET_DIR):
+    """Load the consolidated store, rebuilding it if any daily log is newer"""
+    paths = daily_log_files(dataset_dir)
+    newest = max((os.path.getmtime(p) for p in paths), default=0)
+
+    if os.path.exists(path) and os.path.getmtime(path) >= newest:
+        return EventStore.load(path)
+
+    store = EventStore.from_dataset(dataset_dir)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    store.save(path)
+    return store
@@ -1,38 +1,45 @@
-import pandas as pd
-import json
+import argparse
 from datetime import datetime
 import os
 import re
 
+from day_summary import DaySummary
+from dedup import merge_duplicates
+from event_model import TimelineEvent
+from event_classifier import classify_field, field_categories
+from serialization import dump_file
+from sheet_cache import SheetCache
+from sheet_rows import extract_rows, is_missing
+from text_extractor import QUANTITY, RATING, clock_times, first_value, tokenize, values
+
+# Field-specific patterns, compiled once
+_PLAIN_WATER_RE = re.compile(r'(\d+)\s*oz\s*plain\s*water')
+_BOTTLE_RE = re.compile(r'bottle.*?(\d+)\s*oz')
+_STRESS_RE = re.compile(r'stress.*?(\d+)')
+
 def extract_time_from_text(text, default_date="2025-07-01"):
     """Extract time information from text descriptions"""
-    if pd.isna(text):
+    if is_missing(text):
         return []
     
-    text_str = str(text)
-    times = []
-    
     # Look for time patterns like "22 : 00", "05 : 24", "06 : 54"
-    time_patterns = re.findall(r'(\d{1,2})\s*[:：]\s*(\d{2})', text_str)
-    
-    for hour, minute in time_patterns:
-        iso_time = f"{default_date}T{int(hour):02d}:{int(minute):02d}"
-        times.append(iso_time)
-    
-    return times
+    return [f"{default_date}T{hhmm}" for hhmm in clock_times(tokenize(str(text)))]
 
 def parse_field_entry(field, description, base_date="2025-07-01"):
     """Parse a field entry into timeline events"""
     events = []
     
-    if pd.isna(field) or pd.isna(description):
+    if is_missing(field) or is_missing(description):
         return events
     
     field_str = str(field).strip()
     desc_str = str(description).strip()
     
+    # Tokenize the description once for times and values
+    spans = tokenize(desc_str)
+    
     # Extract times from the description
-    times = extract_time_from_text(desc_str, base_date)
+    times = [f"{base_date}T{hhmm}" for hhmm in clock_times(spans)]
     
     # If no time found, try to extract from field name
     if not times:
@@ -42,15 +49,15 @@ def parse_field_entry(field, description, base_date="2025-07-01"):
     if not times:
         times = [f"{base_date}T12:00"]
     
-    # Process different field types
-    field_lower = field_str.lower()
+    # Classify the field with the shared keyword table
+    event_type, subtype = classify_field(field_str) or ("note", "general")
     
-    if 'sleep' in field_lower:
+    if event_type == "sleep_note" and subtype == "general":
         # Parse sleep information
         sleep_events = parse_sleep_field(desc_str, times, base_date)
         events.extend(sleep_events)
         
-    elif 'wake' in field_lower:
+    elif event_type == "sleep_note" and subtype == "wake":
         # Wake-up state with pain information
         events.append({
             "Time": times[0] if times else f"{base_date}T05:24",
@@ -60,54 +67,50 @@ def parse_field_entry(field, description, base_date="2025-07-01"):
         })
         
         # Extract pain information
-        pain_event = extract_pain_info(desc_str, times[0] if times else f"{base_date}T05:24")
+        pain_event = extract_pain_info(desc_str, times[0] if times else f"{base_date}T05:24", spans)
         if pain_event:
             events.append(pain_event)
             
-    elif 'hydration' in field_lower:
+    elif event_type == "hydration":
         # Parse hydration events
         hydration_events = parse_hydration_field(desc_str, times, base_date)
         events.extend(hydration_events)
         
-    elif 'breakfast' in field_lower or 'lunch' in field_lower or 'dinner' in field_lower:
+    elif event_type == "meal":
         # Meal events
-        meal_type = 'breakfast' if 'breakfast' in field_lower else ('lunch' if 'lunch' in field_lower else 'dinner')
         events.append({
             "Time": times[0] if times else f"{base_date}T12:00",
             "Type": "meal",
-            "Subtype": meal_type,
+            "Subtype": subtype,
             "Notes": desc_str
         })
         
-    elif 'caffeine' in field_lower or 'coffee' in field_lower:
+    elif event_type == "caffeine":
         # Caffeine events
-        caffeine_mg = extract_number_with_unit(desc_str, 'mg')
-        event = {
-            "Time": times[0] if times else f"{base_date}T07:00",
-            "Type": "caffeine",
-            "Subtype": "pour_over_coffee",
-            "Notes": desc_str
-        }
-        if caffeine_mg:
-            event["Value"] = caffeine_mg
-            event["Units"] = "mg"
-        events.append(event)
+        events.append(parse_caffeine_field(desc_str, times, base_date, spans))
         
-    elif 'supplement' in field_lower or 'medication' in field_lower:
+    elif event_type == "supplement":
         # Supplement/medication events
         supplement_events = parse_supplements_field(desc_str, times, base_date)
+        if not supplement_events:
+            # Nothing the supplement list knows ("Meds", "Coffee + meds"): keep the
+            # row as caffeine if the field also names it, else as a generic entry
+            if any(category == "caffeine" for category, _ in field_categories(field_str)):
+                supplement_events = [parse_caffeine_field(desc_str, times, base_date, spans)]
+            else:
+                supplement_events = [generic_supplement_event(desc_str, times, subtype, spans)]
         events.extend(supplement_events)
         
-    elif 'therapy' in field_lower or 'bodycare' in field_lower:
+    elif event_type == "bodycare":
         # Body therapy events
         events.append({
             "Time": times[0] if times else f"{base_date}T07:00",
             "Type": "bodycare",
-            "Subtype": "neck_and_scap_therapy",
+            "Subtype": subtype,
             "Notes": desc_str
         })
         
-    elif 'stress' in field_lower or 'meeting' in field_lower:
+    elif event_type == "stress":
         # Stress/meeting events
         stress_value = extract_stress_level(desc_str)
         event = {
@@ -121,13 +124,13 @@ def parse_field_entry(field, description, base_date="2025-07-01"):
             event["Units"] = "1-10"
         events.append(event)
         
-    elif 'pain' in field_lower:
+    elif event_type == "pain":
         # Pain events
-        pain_event = extract_pain_info(desc_str, times[0] if times else f"{base_date}T12:00")
+        pain_event = extract_pain_info(desc_str, times[0] if times else f"{base_date}T12:00", spans)
         if pain_event:
             events.append(pain_event)
             
-    elif 'bedtime' in field_lower:
+    elif event_type == "sleep_note" and subtype == "bedtime":
         # Bedtime events
         events.append({
             "Time": times[0] if times else f"{base_date}T22:00",
@@ -138,7 +141,7 @@ def parse_field_entry(field, description, base_date="2025-07-01"):
         
         # Check for medication
         if 'unisom' in desc_str.lower():
-            unisom_dose = extract_number_with_unit(desc_str, 'mg')
+            unisom_dose = extract_number_with_unit(desc_str, 'mg', spans)
             events.append({
                 "Time": times[0] if times else f"{base_date}T22:00",
                 "Type": "med",
@@ -147,6 +150,15 @@ def parse_field_entry(field, description, base_date="2025-07-01"):
                 "Units": "mg",
                 "Notes": "Bedtime dose"
             })
+            
+    elif event_type == "activity":
+        # Activity/entertainment events
+        events.append({
+            "Time": times[0] if times else f"{base_date}T12:00",
+            "Type": "activity",
+            "Subtype": subtype,
+            "Notes": desc_str
+        })
     else:
         # Generic note
         events.append({
@@ -222,7 +234,7 @@ def parse_hydration_field(desc_str, times, base_date):
     events = []
     
     # Plain water
-    plain_water_match = re.search(r'(\d+)\s*oz\s*plain\s*water', desc_str)
+    plain_water_match = _PLAIN_WATER_RE.search(desc_str)
     if plain_water_match:
         events.append({
             "Time": f"{base_date}T05:40",
@@ -234,7 +246,7 @@ def parse_hydration_field(desc_str, times, base_date):
         })
     
     # Electrolyte bottle
-    bottle_match = re.search(r'bottle.*?(\d+)\s*oz', desc_str.lower())
+    bottle_match = _BOTTLE_RE.search(desc_str.lower())
     if bottle_match:
         events.append({
             "Time": f"{base_date}T06:45",
@@ -247,6 +259,34 @@ def parse_hydration_field(desc_str, times, base_date):
     
     return events
 
+def parse_caffeine_field(desc_str, times, base_date, spans=None):
+    """Parse caffeine field"""
+    caffeine_mg = extract_number_with_unit(desc_str, 'mg', spans)
+    event = {
+        "Time": times[0] if times else f"{base_date}T07:00",
+        "Type": "caffeine",
+        "Subtype": "pour_over_coffee",
+        "Notes": desc_str
+    }
+    if caffeine_mg:
+        event["Value"] = caffeine_mg
+        event["Units"] = "mg"
+    return event
+
+def generic_supplement_event(desc_str, times, subtype, spans=None):
+    """Supplement/medication event for a row naming nothing in the supplement list"""
+    dose_mg = extract_number_with_unit(desc_str, 'mg', spans)
+    event = {
+        "Time": times[0],
+        "Type": "supplement",
+        "Subtype": subtype,
+        "Notes": desc_str
+    }
+    if dose_mg:
+        event["Value"] = dose_mg
+        event["Units"] = "mg"
+    return event
+
 def parse_supplements_field(desc_str, times, base_date):
     """Parse supplements field"""
     events = []
@@ -274,14 +314,17 @@ def parse_supplements_field(desc_str, times, base_date):
     
     return events
 
-def extract_pain_info(desc_str, time):
+def extract_pain_info(desc_str, time, spans=None):
     """Extract pain information from description"""
+    if spans is None:
+        spans = tokenize(desc_str)
+    
     # Look for pain ratings like "2/10", "2 / 10"
-    pain_ratings = re.findall(r'(\d+)\s*/\s*10', desc_str)
+    pain_ratings = values(spans, RATING)
     
     if pain_ratings:
         # Take the first/highest pain rating
-        pain_value = max([int(rating) for rating in pain_ratings])
+        pain_value = max(pain_ratings)
         
         return {
             "Time": time,
@@ -294,29 +337,64 @@ def extract_pain_info(desc_str, time):
     
     return None
 
-def extract_number_with_unit(text, unit):
+def extract_number_with_unit(text, unit, spans=None):
     """Extract number with specific unit from text"""
-    pattern = rf'(\d+(?:\.\d+)?)\s*{unit}'
-    match = re.search(pattern, text, re.IGNORECASE)
-    return float(match.group(1)) if match else None
+    if spans is None:
+        spans = tokenize(text)
+    
+    quantity = first_value(spans, QUANTITY, (unit.lower(),))
+    return float(quantity.value) if quantity else None
 
 def extract_stress_level(desc_str):
     """Extract stress level from description"""
     # Look for stress ratings
-    stress_match = re.search(r'stress.*?(\d+)', desc_str.lower())
+    stress_match = _STRESS_RE.search(desc_str.lower())
     if stress_match:
         return int(stress_match.group(1))
     return None
 
-def process_excel_journal():
+def excel_pain_episode(event):
+    """PainEpisodes entry for the July 1 journal"""
+    return {
+        "Start": event.time,
+        "Peak": "2025-07-01T13:38",  # Based on existing data
+        "End": "2025-07-01T21:30",   # Based on existing data
+        "Location": "Right temple, right posterior neck, left scap",
+        "Intensity": [event.value, 2.5, 1.5],
+        "Notes": "Pain up to 2.5/10 after emotional meeting; resolved to ≤1.5 by bedtime."
+    }
+
+def read_journal_rows(workbook_path, sheet_cache=True):
+    """(field, description) rows of the journal's first sheet, cached while the workbook is unchanged"""
+    cache = SheetCache(workbook_path, columns=('Field', 'What happened')) if sheet_cache else None
+    cached = cache.load() if cache else None
+    if cached is not None:
+        rows = cached[1][0][1]
+        print(f"Loaded {len(rows)} rows from the sheet cache")
+        return rows
+    
+    # pandas is imported only when the workbook is actually read
+    import pandas as pd
+    
+    with pd.ExcelFile(workbook_path) as xl_file:
+        df = xl_file.parse(0)
+        print(f"Successfully read Excel file with {len(df)} rows")
+        rows = extract_rows(df, 'Field', 'What happened')
+        if cache:
+            cache.save(xl_file.sheet_names, [(xl_file.sheet_names[0], rows)])
+    
+    return rows
+
+def process_excel_journal(pretty=False, sheet_cache=True, sqlite_path=None):
     """Process the Excel journal file"""
     
+    # Assume this is data for July 1, 2025 based on the existing logs
+    base_date = "2025-07-01"
+    filename = f"dataset/migraine_log_{base_date}_from_excel.json"
+    written = None
+    
     try:
-        df = pd.read_excel("full_routine_journal.xlsx")
-        print(f"Successfully read Excel file with {len(df)} rows")
-        
-        # Assume this is data for July 1, 2025 based on the existing logs
-        base_date = "2025-07-01"
+        rows = read_journal_rows("full_routine_journal.xlsx", sheet_cache)
         
         # Initialize the daily log structure
         daily_log = {
@@ -340,82 +418,44 @@ def process_excel_journal():
         }
         
         # Process each row
-        for index, row in df.iterrows():
-            field = row.get('Field', '')
-            description = row.get('What happened', '')
-            
-            if pd.isna(field) and pd.isna(description):
-                continue
-                
+        for field, description in rows:
             print(f"Processing: {field}")
             
             # Parse the field entry into timeline events
             events = parse_field_entry(field, description, base_date)
             daily_log["TimelineEvents"].extend(events)
         
-        # Calculate summary data
-        caffeine_total = 0
-        hydration_total = 0
-        meals = []
-        medications = []
-        pain_episodes = []
+        # Typed events from here on; the sleep and medication rows both log
+        # the bedtime dose, for example, so duplicates are merged first
+        events = [TimelineEvent.from_dict(event) for event in daily_log["TimelineEvents"]]
+        events, _ = merge_duplicates(events)
         
-        for event in daily_log["TimelineEvents"]:
-            if event["Type"] == "caffeine" and "Value" in event:
-                caffeine_total += event["Value"]
-            elif event["Type"] == "hydration" and "Value" in event:
-                hydration_total += event["Value"]
-            elif event["Type"] == "meal":
-                time_part = event["Time"].split("T")[1] if "T" in event["Time"] else "12:00"
-                meals.append({
-                    "Time": time_part,
-                    "Skipped": False,
-                    "Notes": event["Notes"]
-                })
-            elif event["Type"] == "med":
-                time_part = event["Time"].split("T")[1] if "T" in event["Time"] else "12:00"
-                dose_str = f"{event.get('Value', '')} {event.get('Units', '')}".strip()
-                medications.append({
-                    "Time": time_part,
-                    "Name": event["Subtype"],
-                    "Dose": dose_str if dose_str.strip() else event["Subtype"]
-                })
-            elif event["Type"] == "pain" and "Value" in event:
-                pain_episodes.append({
-                    "Start": event["Time"],
-                    "Peak": "2025-07-01T13:38",  # Based on existing data
-                    "End": "2025-07-01T21:30",   # Based on existing data
-                    "Location": "Right temple, right posterior neck, left scap",
-                    "Intensity": [event["Value"], 2.5, 1.5],
-                    "Notes": "Pain up to 2.5/10 after emotional meeting; resolved to ≤1.5 by bedtime."
-                })
+        # Calculate summary data; sleep window and stress level stay as set above
+        summary = DaySummary(pain_episode=excel_pain_episode)
+        for event in events:
+            summary.add(event)
         
         # Update summary fields
-        daily_log["CaffeineMg"] = caffeine_total
-        daily_log["HydrationOz"] = hydration_total
-        daily_log["Meals"] = meals
-        daily_log["Medications"] = medications
-        daily_log["PainEpisodes"] = pain_episodes
+        summary.apply_to(daily_log, ("CaffeineMg", "HydrationOz", "Meals", "Medications", "PainEpisodes"))
         daily_log["Notes"] = "Skipped evening Mg and fish-oil. Movie: 28 Weeks Later. Anxiety episode at bedtime, fragmented sleep."
         
         # Sort timeline events by time
-        daily_log["TimelineEvents"].sort(key=lambda x: x["Time"])
+        events.sort(key=lambda event: event.minute)
+        daily_log["TimelineEvents"] = [event.to_dict() for event in events]
         
         # Save to JSON file
-        filename = f"dataset/migraine_log_{base_date}_from_excel.json"
         os.makedirs("dataset", exist_ok=True)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(daily_log, f, indent=2, ensure_ascii=False)
+        dump_file(daily_log, filename, pretty=pretty)
+        written = daily_log
         
         print(f"\n✅ Created: {filename}")
         print(f"📊 Summary:")
         print(f"  - {len(daily_log['TimelineEvents'])} timeline events")
-        print(f"  - {caffeine_total}mg caffeine")
-        print(f"  - {hydration_total}oz hydration")
-        print(f"  - {len(meals)} meals")
-        print(f"  - {len(medications)} medications")
-        print(f"  - {len(pain_episodes)} pain episodes")
+        print(f"  - {daily_log['CaffeineMg']}mg caffeine")
+        print(f"  - {daily_log['HydrationOz']}oz hydration")
+        print(f"  - {len(daily_log['Meals'])} meals")
+        print(f"  - {len(daily_log['Medications'])} medications")
+        print(f"  - {len(daily_log['PainEpisodes'])} pain episodes")
         
         # Show timeline events
         print(f"\n📅 Timeline Events:")
@@ -427,6 +467,30 @@ def process_excel_journal():
         print(f"Error processing Excel file: {e}")
         import traceback
         traceback.print_exc()
+    
+    if sqlite_path:
+        upsert_journal_day(sqlite_path, written, filename, base_date)
+
+def upsert_journal_day(sqlite_path, daily_log, filename, date):
+    """Upsert the parsed day, or the existing JSON if parsing failed and the database lacks the day"""
+    from sqlite_store import EXCEL_JOURNAL_SOURCE, SqliteStore
+    
+    with SqliteStore(sqlite_path) as database:
+        if daily_log is not None:
+            database.upsert_day(daily_log, source=EXCEL_JOURNAL_SOURCE)
+        elif os.path.exists(filename) and not database.has_day(date, EXCEL_JOURNAL_SOURCE):
+            database.upsert_file(filename, source=EXCEL_JOURNAL_SOURCE)
+            print(f"🗄️ Upserted the existing {filename} instead")
 
 if __name__ == "__main__":
-    process_excel_journal() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Convert the routine journal's first sheet into a daily log")
+    parser.add_argument("--pretty", action="store_true",
+                        help="indent the daily log JSON file for reading (default: compact)")
+    parser.add_argument("--no-sheet-cache", action="store_true",
+                        help="always read the xlsx instead of reusing rows cached from an unchanged workbook")
+    parser.add_argument("--sqlite", metavar="PATH", nargs="?", const="dataset/migraine_logs.sqlite3",
+                        help="also upsert the daily log into a SQLite database "
+                             "(default path: dataset/migraine_logs.sqlite3)")
+    args = parser.parse_args()
+    
+    process_excel_journal(pretty=args.pretty, sheet_cache=not args.no_sheet_cache, sqlite_path=args.sqlite) 
\ No newline at end of file
@@ -0,0 +1,122 @@
+import math
+import os
+import pickle
+from collections import OrderedDict
+
+EXTRACTION_CACHE_PATH = ".ingest_cache/extraction_cache.pkl"
+
+# Bump when the key layout changes so older persisted entries are dropped
+CACHE_FORMAT = 2
+
+def _key_part(value):
+    # Empty cells arrive as NaN, which never equals itself (and a pickled
+    # NaN is a new object), so they are keyed as None
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+class ExtractionCache:
+    """Bounded LRU cache of per-row extraction results keyed on (field, description).
+
+    The journal repeats many cells verbatim across days (supplement stacks,
+    breakfasts, bedtime lines), so re-ingesting mostly hits the cache instead
+    of re-running the classifier and regexes. Entries are persisted between
+    runs and dropped when the parser version changes.
+    """
+
+    def __init__(self, maxsize=50000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Set in pool workers: entries added since the last take_delta()
+        self._added = None
+
+    def get(self, field, description, compute):
+        """Cached compute(field, description)"""
+        key = (_key_part(field), _key_part(description))
+        try:
+            result = self._entries[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable cell value; nothing to cache
+            self.misses += 1
+            return compute(field, description)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self._entries[key] = compute(field, description)
+        if self._added is not None:
+            self._added.append((key, result))
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Hit/miss counters for reporting"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def entries(self):
+        """(key, result) pairs, least recently used first"""
+        return list(self._entries.items())
+
+    def update(self, entries):
+        """Add (key, result) pairs as the most recently used entries"""
+        for key, result in entries:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def track_delta(self):
+        """Start recording what take_delta() reports (used in pool workers)"""
+        self._added = []
+        self.hits = self.misses = 0
+
+    def take_delta(self):
+        """(new entries, hits, misses) since the last call, then reset them"""
+        delta = self._added or [], self.hits, self.misses
+        self._added = []
+        self.hits = self.misses = 0
+        return delta
+
+    def merge_delta(self, delta):
+        """Fold a worker's take_delta() into this cache and its counters"""
+        added, hits, misses = delta
+        self.update(added)
+        self.hits += hits
+        self.misses += misses
+
+    def load(self, path, version):
+        """Load persisted entries written by the same parser version"""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        if data.get("version") != version or data.get("format") != CACHE_FORMAT:
+            return
+        self.update(data["entries"])
+
+    def save(self, path, version):
+        """Persist entries (least recently used first) for the next run"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"version": version, "format": CACHE_FORMAT, "entries": self.entries()}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
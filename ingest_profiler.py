@@ -0,0 +1,113 @@
+import time
+import traceback
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+from serialization import dump_file
+
+# Pipeline stages reported by process_all_sheets, in pipeline order
+STAGES = ("workbook_open", "sheet_read", "row_extraction", "classification",
+          "value_extraction", "aggregation", "serialization")
+
+class IngestProfiler:
+    """Per-stage timers, per-sheet counters and captured errors for one ingest run"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.stages = defaultdict(float)
+        self.sheets = {}
+        self.errors = []
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block and add it to the named stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def merge_stages(self, stages):
+        """Add stage totals measured elsewhere (e.g. in a worker process)"""
+        for name, seconds in stages.items():
+            self.stages[name] += seconds
+
+    def sheet(self, sheet_name):
+        """Counters for one sheet, created on first use"""
+        if sheet_name not in self.sheets:
+            self.sheets[sheet_name] = {"rows": 0, "events": 0, "errors": 0, "status": "pending"}
+        return self.sheets[sheet_name]
+
+    def record_error(self, sheet_name, error, stage):
+        """Keep the traceback of an exception the pipeline recovered from"""
+        if sheet_name is not None:
+            counters = self.sheet(sheet_name)
+            counters["errors"] += 1
+            counters["status"] = "error"
+        self.errors.append({
+            "sheet": sheet_name,
+            "stage": stage,
+            "error": f"{type(error).__name__}: {error}",
+            "traceback": "".join(traceback.format_exception(type(error), error, error.__traceback__)),
+        })
+
+    def report(self, **extra):
+        """Machine-readable summary of the run"""
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "total_seconds": time.perf_counter() - self._start,
+            "stages": {name: self.stages.get(name, 0.0) for name in STAGES}
+                      | {name: seconds for name, seconds in self.stages.items() if name not in STAGES},
+            "sheets": self.sheets,
+            "errors": self.errors,
+            **extra,
+        }
+
+    def write_report(self, path, **extra):
+        """Write report() as JSON"""
+        dump_file(self.report(**extra), path, pretty=True)
+
+class NullProfiler:
+    """Stand-in with the IngestProfiler interface that records nothing"""
+
+    _context = nullcontext()
+
+    def stage(self, name):
+        return self._context
+
+    def merge_stages(self, stages):
+        pass
+
+    def sheet(self, sheet_name):
+        return {"rows": 0, "events": 0, "errors": 0, "status": "pending"}
+
+    def record_error(self, sheet_name, error, stage):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+@contextmanager
+def code_profiler(kind, output_path):
+    """Run the block under cProfile or pyinstrument and save the result to output_path"""
+    if kind == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output_path)
+    elif kind == "pyinstrument":
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html() if output_path.endswith(".html") else profiler.output_text())
+    else:
+        yield
@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import contextlib
+import glob
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from multi_day_excel_parser import WORKBOOK_PATH
+
+def warm_up():
+    """Worker: import the parsers and load the persisted extraction cache once"""
+    from extraction_cache import EXTRACTION_CACHE_PATH
+    from multi_day_excel_parser import EXTRACTION_CACHE, PARSER_VERSION
+
+    EXTRACTION_CACHE.load(EXTRACTION_CACHE_PATH, PARSER_VERSION)
+
+def ingest_workbook(workbook_path, streaming=False, verbose=False):
+    """Worker: incrementally ingest one workbook and return the daily logs it rewrote"""
+    from multi_day_excel_parser import daily_log_path, process_all_sheets
+
+    # The worker's extraction cache stays warm between runs, so it is not
+    # reloaded from disk each time
+    output = None if verbose else io.StringIO()
+    with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+        profiler = process_all_sheets(workbook_path, streaming=streaming, cache_path=None)
+
+    written = [daily_log_path(sheet_name) for sheet_name, counters in profiler.sheets.items()
+               if counters["status"] == "written"]
+    errors = [error["error"] for error in profiler.errors]
+    return written, errors
+
+def file_stamp(path):
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class IngestWatcher:
+    """Re-ingest workbooks shortly after they are saved.
+
+    Watched workbooks (and every *.xlsx in an optional drop directory) are
+    polled for mtime/size changes; a change is ingested once the file has
+    been stable for `debounce` seconds, so a burst of saves costs one run.
+    Parsing happens in one long-lived worker process that keeps the parsers
+    imported and the extraction cache warm, and the ingest manifest limits
+    each run to the sheets that changed. Runs are serialized because they
+    share the manifest.
+    """
+
+    def __init__(self, workbooks=(WORKBOOK_PATH,), drop_dir=None, debounce=0.5, poll=0.25,
+                 streaming=False, verbose=False):
+        self.workbooks = list(workbooks)
+        self.drop_dir = drop_dir
+        self.debounce = debounce
+        self.poll = poll
+        self.streaming = streaming
+        self.verbose = verbose
+        self.ingested = {}   # path -> stamp of the last ingest
+        self.pending = {}    # path -> (stamp, monotonic time it was first seen)
+        self.running = set()
+        self._lock = asyncio.Lock()
+
+    def watched_paths(self):
+        """Watched workbooks plus the workbooks currently in the drop directory"""
+        paths = list(self.workbooks)
+        if self.drop_dir:
+            # Skip the ~$ lock files Excel writes next to open workbooks
+            paths += sorted(path for path in glob.glob(os.path.join(self.drop_dir, "*.xlsx"))
+                            if not os.path.basename(path).startswith("~$"))
+        return paths
+
+    def ready_paths(self, now):
+        """Paths whose changes have settled for the debounce interval"""
+        ready = []
+        for path in self.watched_paths():
+            stamp = file_stamp(path)
+            if stamp is None:
+                self.ingested.pop(path, None)
+                self.pending.pop(path, None)
+                continue
+            if stamp == self.ingested.get(path) or path in self.running:
+                continue
+
+            seen = self.pending.get(path)
+            if seen is None or seen[0] != stamp:
+                # New or still changing; restart its debounce timer
+                self.pending[path] = (stamp, now)
+            elif now - seen[1] >= self.debounce:
+                del self.pending[path]
+                ready.append((path, stamp))
+        return ready
+
+    async def ingest(self, loop, executor, path, stamp):
+        """Run one ingest in the worker process without blocking the event loop"""
+        self.running.add(path)
+        try:
+            async with self._lock:
+                start = time.perf_counter()
+                try:
+                    written, errors = await loop.run_in_executor(
+                        executor, ingest_workbook, path, self.streaming, self.verbose)
+                except Exception as e:
+                    print(f"❌ Error ingesting '{path}': {e}")
+                    return
+
+                # A save during the run changes the stamp, so it is picked up again
+                self.ingested[path] = stamp
+                elapsed = time.perf_counter() - start
+                print(f"🔄 {path}: {len(written)} daily logs updated in {elapsed:.2f}s")
+                for filename in written:
+                    print(f"   ✓ {filename}")
+                for error in errors:
+                    print(f"   ❌ {error}")
+        finally:
+            self.running.discard(path)
+
+    async def run(self):
+        """Watch until cancelled"""
+        loop = asyncio.get_running_loop()
+        tasks = set()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            await loop.run_in_executor(executor, warm_up)
+            print(f"👀 Watching {', '.join(self.watched_paths()) or 'nothing yet'}"
+                  + (f" and {self.drop_dir}/*.xlsx" if self.drop_dir else ""))
+
+            while True:
+                for path, stamp in self.ready_paths(time.monotonic()):
+                    task = asyncio.create_task(self.ingest(loop, executor, path, stamp))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                await asyncio.sleep(self.poll)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-ingest journal workbooks whenever they are saved")
+    parser.add_argument("--workbook", action="append", dest="workbooks",
+                        help=f"workbook to watch; repeatable (default: {WORKBOOK_PATH})")
+    parser.add_argument("--drop-dir", help="also watch every *.xlsx in this directory")
+    parser.add_argument("--debounce", type=float, default=0.5,
+                        help="seconds a file must be unchanged before it is ingested (default: 0.5)")
+    parser.add_argument("--poll", type=float, default=0.25,
+                        help="seconds between checks for changes (default: 0.25)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="read workbooks in openpyxl read-only streaming mode")
+    parser.add_argument("--verbose", action="store_true",
+                        help="show the parser's full per-sheet output")
+    args = parser.parse_args()
+
+    workbooks = args.workbooks if args.workbooks is not None else ([] if args.drop_dir else [WORKBOOK_PATH])
+    watcher = IngestWatcher(workbooks, args.drop_dir, args.debounce, args.poll,
+                            args.streaming, args.verbose)
+    try:
+        asyncio.run(watcher.run())
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
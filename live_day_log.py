@@ -0,0 +1,87 @@
+import bisect
+import os
+
+from day_summary import DaySummary, new_daily_log, notes_of, time_part
+from event_model import DailyLog, TimelineEvent
+from ndjson_stream import dumps_line, read_ndjson
+from serialization import dump_file, load_file
+
+def _event_minute(event):
+    return event.minute
+
+def timeline_lines(events):
+    """Lines for "show today's timeline": one HH:MM → event line per TimelineEvent"""
+    lines = []
+    for event in events:
+        value = f" {event.value} {event.units or ''}".rstrip() if event.value is not None else ""
+        lines.append(f"{time_part(event, '00:00')} → {str(event.type)} ({event.subtype}){value}: "
+                     f"{notes_of(event)}")
+    return lines
+
+class LiveDayLog:
+    """A daily log built up one message at a time.
+
+    Events are inserted in time order with bisect (no full re-sort), the
+    summary is updated incrementally through DaySummary, and each new event
+    is appended to a write-ahead file next to the day's JSON. compact() at
+    the nightly wrap writes the full JSON and drops the write-ahead file;
+    opening a day replays any events logged since the last compaction.
+
+    The summary resumes from the stored JSON's fields, so hand-edited totals
+    and lists are kept and only events added since (including replayed ones)
+    are folded in; a day with nothing new is written back unchanged.
+    """
+
+    def __init__(self, date, dataset_dir="dataset"):
+        self.date = date
+        self.path = os.path.join(dataset_dir, f"migraine_log_{date}.json")
+        self.wal_path = os.path.join(dataset_dir, f"migraine_log_{date}.wal")
+
+        daily_log = load_file(self.path) if os.path.exists(self.path) else new_daily_log(date)
+        self.day = DailyLog.from_dict(daily_log)
+        self.events = self.day.events
+        self.summary = DaySummary().resume(daily_log, self.events)
+        self.added = 0
+
+        if os.path.exists(self.wal_path):
+            for event in read_ndjson(self.wal_path):
+                self._insert(TimelineEvent.from_dict(event))
+
+    def _insert(self, event):
+        # insort_right keeps same-time events in arrival order, like a stable sort
+        bisect.insort_right(self.events, event, key=_event_minute)
+        self.summary.add(event)
+        self.added += 1
+
+    def add(self, event):
+        """Log one TimelineEvent dict: insert it in time order and persist only the delta"""
+        self._insert(TimelineEvent.from_dict(event))
+
+        os.makedirs(os.path.dirname(self.wal_path) or ".", exist_ok=True)
+        with open(self.wal_path, 'a', encoding='utf-8') as f:
+            f.write(dumps_line(event))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def quick_stats(self):
+        """Current totals, without recomputing the day"""
+        return self.summary.quick_stats()
+
+    def timeline(self):
+        """Lines for "show today's timeline", including events not yet compacted"""
+        return timeline_lines(self.events)
+
+    def to_dict(self):
+        """The full daily log, with summary fields updated only if events were added"""
+        daily_log = self.day.to_dict()
+        return self.summary.apply_to(daily_log) if self.added else daily_log
+
+    def compact(self, pretty=False):
+        """Nightly wrap: write the full daily log JSON and clear the write-ahead file"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        dump_file(self.to_dict(), tmp_path, pretty=pretty)
+        os.replace(tmp_path, self.path)
+
+        if os.path.exists(self.wal_path):
+            os.remove(self.wal_path)
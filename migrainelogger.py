@@ -0,0 +1,226 @@
+"""migraineLogger command line: ingest the journal workbook, or query dataset/.
+
+    python migrainelogger.py ingest [--workbook PATH] [--workers N] [--streaming] ...
+    python migrainelogger.py show 2025-07-01
+    python migrainelogger.py stats [DATE ...] [--json]
+    python migrainelogger.py triggers [--freq D|H] [--max-lag N]
+    python migrainelogger.py enrich --weather observations.csv
+    python migrainelogger.py export --sqlite dataset/migraine_logs.sqlite3
+    python migrainelogger.py consolidate
+
+Only the module a command needs is imported, inside its handler: show and
+stats read the stored dataset/*.json files as they are (summary fields
+included) and never load pandas or openpyxl, so they start in tens of
+milliseconds.
+"""
+import argparse
+import os
+import sys
+
+from dataset_files import DATASET_DIR, daily_log_dates
+
+def daily_log_path(date, dataset_dir=DATASET_DIR):
+    """Path of a day's daily log JSON"""
+    return os.path.join(dataset_dir, f"migraine_log_{date}.json")
+
+def day_stats(daily_log):
+    """Counts and totals for the stats table, read from a daily log's stored fields"""
+    return {
+        "Events": len(daily_log.get("TimelineEvents", [])),
+        "CaffeineMg": daily_log.get("CaffeineMg", 0),
+        "HydrationOz": daily_log.get("HydrationOz", 0),
+        "StressLevel": daily_log.get("StressLevel"),
+        "Meals": len(daily_log.get("Meals") or []),
+        "Medications": len(daily_log.get("Medications") or []),
+        "PainEpisodes": len(daily_log.get("PainEpisodes") or []),
+        "SleepWindow": daily_log.get("SleepWindow") or {"Bed": "", "Wake": ""},
+    }
+
+def cmd_ingest(args):
+    from multi_day_excel_parser import EXTRACTION_CACHE_PATH, process_all_sheets
+    from ingest_profiler import code_profiler
+
+    with code_profiler(args.profile, args.profile_out):
+        profiler = process_all_sheets(args.workbook, workers=args.workers, incremental=not args.full,
+                                      ndjson_path=args.ndjson, ndjson_events=args.ndjson_events,
+                                      pretty=args.pretty,
+                                      cache_path=None if args.no_cache else EXTRACTION_CACHE_PATH,
+                                      report_path=args.report, sheet_cache=not args.no_sheet_cache,
+                                      streaming=args.streaming, sqlite_path=args.sqlite)
+    return 1 if profiler.errors else 0
+
+def cmd_show(args):
+    from event_model import DailyLog
+    from live_day_log import timeline_lines
+    from serialization import load_file
+
+    path = daily_log_path(args.date, args.dataset_dir)
+    if not os.path.exists(path):
+        print(f"No daily log for {args.date} in {args.dataset_dir}/")
+        return 1
+
+    print(f"📅 {args.date}")
+    for line in timeline_lines(DailyLog.from_dict(load_file(path)).events):
+        print(f"  {line}")
+    return 0
+
+def cmd_stats(args):
+    from serialization import dumps, load_file
+
+    dates = args.dates or daily_log_dates(args.dataset_dir)
+    missing = [date for date in dates if not os.path.exists(daily_log_path(date, args.dataset_dir))]
+    if missing:
+        print(f"No daily log for {', '.join(missing)} in {args.dataset_dir}/")
+        return 1
+
+    stats = {date: day_stats(load_file(daily_log_path(date, args.dataset_dir))) for date in dates}
+    if args.json:
+        print(dumps(stats, pretty=True))
+        return 0
+
+    print(f"{'Date':<10} {'Events':>6} {'Caffeine':>9} {'Water':>6} {'Stress':>6} "
+          f"{'Meals':>5} {'Meds':>4} {'Pain':>4}  Sleep")
+    for date, day in stats.items():
+        stress = "" if day["StressLevel"] is None else day["StressLevel"]
+        sleep = f"{day['SleepWindow']['Bed'] or '?'}–{day['SleepWindow']['Wake'] or '?'}"
+        print(f"{date:<10} {day['Events']:>6} {day['CaffeineMg']:>7}mg {day['HydrationOz']:>4}oz "
+              f"{stress:>6} {day['Meals']:>5} {day['Medications']:>4} {day['PainEpisodes']:>4}  {sleep}")
+    return 0
+
+def cmd_triggers(args):
+    from event_store import EventStore
+    from trigger_analysis import trigger_report
+
+    rows = trigger_report(EventStore.from_dataset(args.dataset_dir), args.freq, args.max_lag,
+                          args.pain_threshold)
+
+    def rate(value):
+        return "" if value is None else f"{value:.0%}"
+
+    unit = "h" if args.freq == "H" else "d"
+    print(f"{'Feature':<17} {'Lag':>4} {'Corr':>6} {'Pairs':>6} {'P(pain|any)':>12} {'P(pain|none)':>13}")
+    for row in rows[:args.top]:
+        corr = "" if row["correlation"] is None else f"{row['correlation']:+.2f}"
+        print(f"{row['feature']:<17} {row['lag']:>3}{unit} {corr:>6} {row['pairs']:>6} "
+              f"{rate(row['exposed_rate']):>12} {rate(row['unexposed_rate']):>13}")
+    return 0
+
+def cmd_enrich(args):
+    from weather_enrichment import enrich_dataset
+
+    written = enrich_dataset(args.weather, args.dataset_dir, args.reference_time,
+                             overwrite=args.overwrite, pretty=args.pretty)
+    print(f"🌦️ Filled Weather in {len(written)} daily logs")
+    for path in written:
+        print(f"   ✓ {path}")
+    return 0
+
+def cmd_export(args):
+    from sqlite_store import SqliteStore
+
+    with SqliteStore(args.sqlite) as database:
+        written = database.export_json(args.dataset_dir, args.source, args.dates or None, args.pretty)
+    print(f"📤 Exported {len(written)} daily logs from {args.sqlite}")
+    return 0
+
+def cmd_consolidate(args):
+    from dedup import consolidate_dataset
+
+    report = consolidate_dataset(args.dataset_dir, args.output_dir, args.pretty, args.bucket_minutes)
+    print(f"🧹 Consolidated {len(report)} days spread over several files")
+    for date, (paths, before, after) in report.items():
+        print(f"   ✓ {date}: {len(paths)} files, {before} → {after} events")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="migrainelogger", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="parse the journal workbook into dataset/ daily logs")
+    ingest.add_argument("--workbook", default="full_routine_journal.xlsx",
+                        help="path to the multi-sheet journal workbook (default: full_routine_journal.xlsx)")
+    ingest.add_argument("--workers", type=int, default=1,
+                        help="parse sheets in this many worker processes (default: 1)")
+    ingest.add_argument("--full", action="store_true",
+                        help="re-parse every sheet even if its rows are unchanged since the last run")
+    ingest.add_argument("--streaming", action="store_true",
+                        help="read the workbook row by row in openpyxl read-only mode")
+    ingest.add_argument("--ndjson", metavar="PATH",
+                        help="also append each finished daily log as one line to PATH "
+                             "('-' for stdout; progress lines then go to stderr)")
+    ingest.add_argument("--ndjson-events", action="store_true",
+                        help="with --ndjson, write one line per TimelineEvent (tagged with its Date)")
+    ingest.add_argument("--pretty", action="store_true",
+                        help="indent daily log and manifest JSON for reading (default: compact)")
+    ingest.add_argument("--no-cache", action="store_true",
+                        help="do not load or save the persisted per-row extraction cache")
+    ingest.add_argument("--no-sheet-cache", action="store_true",
+                        help="always read the xlsx instead of reusing rows cached from an unchanged workbook")
+    ingest.add_argument("--sqlite", metavar="PATH", nargs="?", const="dataset/migraine_logs.sqlite3",
+                        help="also upsert each daily log into a SQLite database "
+                             "(default path: dataset/migraine_logs.sqlite3)")
+    ingest.add_argument("--report", metavar="PATH",
+                        help="write per-stage timings, per-sheet counters and errors as JSON")
+    ingest.add_argument("--profile", choices=["cprofile", "pyinstrument"],
+                        help="run the ingest under a code profiler (parent process only)")
+    ingest.add_argument("--profile-out", metavar="PATH", default="ingest.prof",
+                        help="where to save the profiler output (default: ingest.prof)")
+    ingest.set_defaults(handler=cmd_ingest)
+
+    show = commands.add_parser("show", help="print one day's timeline")
+    show.add_argument("date", help="YYYY-MM-DD")
+    show.set_defaults(handler=cmd_show)
+
+    stats = commands.add_parser("stats", help="summary totals per day")
+    stats.add_argument("dates", nargs="*", metavar="DATE", help="YYYY-MM-DD (default: every day in dataset/)")
+    stats.add_argument("--json", action="store_true", help="print the stats as JSON")
+    stats.set_defaults(handler=cmd_stats)
+
+    triggers = commands.add_parser("triggers", help="lagged correlations of intake/sleep/stress with pain")
+    triggers.add_argument("--freq", choices=["D", "H"], default="D", help="daily or hourly buckets (default: D)")
+    triggers.add_argument("--max-lag", type=int, default=3, help="largest lag in buckets (default: 3)")
+    triggers.add_argument("--pain-threshold", type=int, default=1,
+                          help="pain rating that counts as an onset (default: 1)")
+    triggers.add_argument("--top", type=int, default=15, help="rows to print (default: 15)")
+    triggers.set_defaults(handler=cmd_triggers)
+
+    enrich = commands.add_parser("enrich", help="fill each daily log's Weather from local hourly observations")
+    enrich.add_argument("--weather", required=True, metavar="PATH",
+                        help="hourly observations (.csv or .parquet) with time, temp_f and pressure columns")
+    enrich.add_argument("--reference-time", default="22:30", metavar="HH:MM",
+                        help="local time of day the Weather block describes (default: 22:30, the nightly wrap)")
+    enrich.add_argument("--overwrite", action="store_true", help="also refill logs that already have Weather")
+    enrich.add_argument("--pretty", action="store_true",
+                        help="indent rewritten daily log JSON for reading (default: compact)")
+    enrich.set_defaults(handler=cmd_enrich)
+
+    export = commands.add_parser("export", help="write daily log JSON files back out of a SQLite database")
+    export.add_argument("dates", nargs="*", metavar="DATE", help="YYYY-MM-DD (default: every stored day)")
+    export.add_argument("--sqlite", default="dataset/migraine_logs.sqlite3", metavar="PATH",
+                        help="database written by ingest --sqlite (default: dataset/migraine_logs.sqlite3)")
+    export.add_argument("--source", choices=["workbook", "excel_journal"], default="workbook",
+                        help="which parser's days to export (default: workbook)")
+    export.add_argument("--pretty", action="store_true", help="indent the JSON for reading (default: compact)")
+    export.set_defaults(handler=cmd_export)
+
+    consolidate = commands.add_parser("consolidate",
+                                      help="merge each day's copies (.json, extensionless, _from_excel) "
+                                           "into one deduplicated daily log")
+    consolidate.add_argument("--output-dir", metavar="DIR",
+                             help="write the merged daily logs here instead of over the canonical files")
+    consolidate.add_argument("--bucket-minutes", type=int, default=5,
+                             help="events this close with the same Type/Subtype/Value are merged (default: 5)")
+    consolidate.add_argument("--pretty", action="store_true", help="indent the JSON for reading (default: compact)")
+    consolidate.set_defaults(handler=cmd_consolidate)
+
+    for command in (show, stats, triggers, enrich, export, consolidate):
+        command.add_argument("--dataset-dir", default=DATASET_DIR,
+                             help=f"directory of daily log JSON files (default: {DATASET_DIR})")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,253 +1,211 @@
-import pandas as pd
-import json
+import argparse
+from contextlib import nullcontext, redirect_stdout
+import hashlib
 from datetime import datetime
 import os
 import re
+import sys
+from collections import deque
+
+from day_summary import DaySummary, new_daily_log
+from dedup import merge_duplicates
+from event_classifier import classify_field
+from event_model import TimelineEvent
+from extraction_cache import EXTRACTION_CACHE_PATH, ExtractionCache
+from ingest_profiler import NULL_PROFILER, IngestProfiler, code_profiler
+from ndjson_stream import NdjsonWriter
+from segmenter import MIN_ANCHORS, SEGMENTED_TYPES, drop_running_totals, segment_text, split_segments
+from serialization import dump_file, load_file
+from sheet_cache import SheetCache
+from sheet_rows import extract_rows, is_missing, iter_workbook_sheets, workbook_sheet_names
+from text_extractor import FOG, QUANTITY, RATING, clock_times, first_value, tokenize, values
+
+WORKBOOK_PATH = 'full_routine_journal.xlsx'
+MANIFEST_PATH = 'dataset_manifest.json'
+
+# Bump whenever parsing rules change so incremental runs rebuild every sheet
+PARSER_VERSION = "6"
+
+# Per-row extraction results shared across sheets (and runs, via EXTRACTION_CACHE_PATH)
+EXTRACTION_CACHE = ExtractionCache()
+
+# Sleep-cell patterns, compiled once
+_IN_BED_RE = re.compile(r'in bed.*?(\d{1,2})\s*[:：]\s*(\d{2})')
+_ASLEEP_RE = re.compile(r'asleep.*?(\d{1,2})\s*[:：]\s*(\d{2})')
+_WOKE_RE = re.compile(r'(?:woke|awake|up).*?(\d{1,2})\s*[:：]\s*(\d{2})')
 
 def extract_time_from_text(text, default_date="2025-07-01"):
     """Extract time information from text descriptions"""
-    if pd.isna(text):
+    if is_missing(text):
         return []
     
-    text_str = str(text)
-    times = []
-    
     # Look for time patterns like "22 : 00", "05 : 24", "06 : 54"
-    time_patterns = re.findall(r'(\d{1,2})\s*[:：]\s*(\d{2})', text_str)
-    
-    for hour, minute in time_patterns:
-        iso_time = f"{default_date}T{int(hour):02d}:{int(minute):02d}"
-        times.append(iso_time)
-    
-    return times
+    return [f"{default_date}T{hhmm}" for hhmm in clock_times(tokenize(str(text)))]
 
 def categorize_event(field, description):
     """Categorize events based on field name and description"""
-    if pd.isna(field) or pd.isna(description):
+    if is_missing(field) or is_missing(description):
         return "note", "general", str(description)
     
     field_str = str(field).lower().strip()
     desc_str = str(description).strip()
     
-    # Sleep-related fields
-    if 'sleep' in field_str:
-        return "sleep_note", "general", desc_str
-    elif 'wake' in field_str:
-        return "sleep_note", "wake", desc_str
-    elif 'bedtime' in field_str:
-        return "sleep_note", "bedtime", desc_str
-        
-    # Pain/fog related
-    elif any(word in field_str for word in ['pain', 'fog', 'wake-up state', 'wake state']):
-        return "pain", "status_update", desc_str
-        
-    # Hydration
-    elif 'hydration' in field_str or 'bottle' in field_str:
-        return "hydration", "water", desc_str
-        
-    # Meals
-    elif any(word in field_str for word in ['breakfast', 'lunch', 'dinner', 'meal', 'snack']):
-        meal_type = 'breakfast' if 'breakfast' in field_str else ('lunch' if 'lunch' in field_str else 'dinner')
-        return "meal", meal_type, desc_str
-        
-    # Supplements/medications
-    elif 'supplement' in field_str or 'medication' in field_str or 'med' in field_str:
-        return "supplement", "general", desc_str
-        
-    # Exercise/therapy
-    elif any(word in field_str for word in ['exercise', 'therapy', 'care', 'stretch']):
-        return "bodycare", "therapy", desc_str
-        
-    # Caffeine/coffee
-    elif 'caffeine' in field_str or 'coffee' in field_str:
-        return "caffeine", "coffee", desc_str
-        
-    # Stress/meetings
-    elif any(word in field_str for word in ['stress', 'meeting', 'work', 'anxiety']):
-        return "stress", "meeting" if 'meeting' in field_str else "general", desc_str
-        
-    # Activity/entertainment
-    elif any(word in field_str for word in ['movie', 'activity', 'entertainment']):
-        return "activity", "movie" if 'movie' in field_str else "general", desc_str
-        
-    # Default
-    else:
+    # Look the field up in the shared keyword table
+    category = classify_field(field_str)
+    if category is None:
         return "note", "general", f"{field_str}: {desc_str}"
+    
+    event_type, subtype = category
+    return event_type, subtype, desc_str
 
-def extract_numeric_values(desc_str, event_type):
+def extract_numeric_values(desc_str, event_type, spans=None):
     """Extract numeric values from descriptions"""
-    if pd.isna(desc_str):
+    if is_missing(desc_str):
         return None, None
     
-    desc_lower = str(desc_str).lower()
+    if spans is None:
+        spans = tokenize(str(desc_str))
     
     if event_type == "pain":
         # Look for pain/fog ratings like "2/10", "fog 3"
-        pain_match = re.search(r'(\d+)\s*/\s*10', desc_lower)
-        if pain_match:
-            return int(pain_match.group(1)), "1-10"
-        fog_match = re.search(r'fog\s*(\d+)', desc_lower)
-        if fog_match:
-            return int(fog_match.group(1)), "1-10"
+        rating = first_value(spans, RATING) or first_value(spans, FOG)
+        if rating:
+            return rating.value, "1-10"
             
     elif event_type == "hydration":
         # Look for ounces
-        oz_matches = re.findall(r'(\d+)\s*oz', desc_lower)
-        if oz_matches:
+        oz_values = values(spans, QUANTITY, ("oz",))
+        if oz_values:
             # Sum all oz mentions
-            total_oz = sum(int(oz) for oz in oz_matches)
-            return total_oz, "oz"
+            return sum(oz_values), "oz"
             
     elif event_type == "caffeine":
         # Look for mg or estimate
-        mg_match = re.search(r'(\d+)\s*mg', desc_lower)
-        if mg_match:
-            return int(mg_match.group(1)), "mg"
-        elif 'coffee' in desc_lower:
+        mg = first_value(spans, QUANTITY, ("mg",))
+        if mg:
+            return int(mg.value), "mg"
+        elif 'coffee' in str(desc_str).lower():
             return 120, "mg"  # Standard estimate
             
     elif event_type in ["supplement", "med"]:
         # Look for dosages
-        dose_match = re.search(r'(\d+(?:\.\d+)?)\s*(mg|g)', desc_lower)
-        if dose_match:
-            return float(dose_match.group(1)), dose_match.group(2)
+        dose = first_value(spans, QUANTITY, ("mg", "g"))
+        if dose:
+            return float(dose.value), dose.unit
     
     return None, None
 
 def parse_sheet_data(sheet_name, df):
     """Parse data from a single sheet into timeline events"""
+    return parse_sheet_rows(sheet_name, extract_rows(df))
+
+def extract_row(field, description, profiler=NULL_PROFILER):
+    """Date-independent extraction for one row, suitable for caching across days"""
+    with profiler.stage("value_extraction"):
+        # Tokenize the description once for times and values
+        spans = [] if is_missing(description) else tokenize(str(description))
+        
+        # Extract times (HH:MM) from description, then field
+        times = clock_times(spans)
+        if not times and not is_missing(field):
+            times = clock_times(tokenize(str(field)))
     
-    print(f"\n📋 Processing sheet: {sheet_name}")
-    
-    # Initialize daily log structure
-    daily_log = {
-        "Date": sheet_name,
-        "TimelineEvents": [],
-        "SleepWindow": {"Bed": "", "Wake": ""},
-        "CaffeineMg": 0,
-        "HydrationOz": 0,
-        "StressLevel": None,
-        "StressNotes": "",
-        "Meals": [],
-        "Medications": [],
-        "PainEpisodes": [],
-        "Weather": {},
-        "Reflection": {
-            "Accomplishments": "",
-            "Bothering": "",
-            "TomorrowPlan": ""
-        },
-        "Notes": ""
-    }
+    # Categorize the event
+    with profiler.stage("classification"):
+        event_type, subtype, notes = categorize_event(field, description)
     
-    # Process each row
-    for index, row in df.iterrows():
-        if row.isna().all():
-            continue
-            
-        # Get field and description from the row
-        field = None
-        description = None
+    with profiler.stage("value_extraction"):
+        # Running totals ("Total fluids ≈ 80 oz") would count the items twice
+        value_spans = drop_running_totals(str(description), spans)
         
-        # Find the Field column and the data column
-        for col in df.columns:
-            if 'field' in str(col).lower():
-                field = row[col]
-            else:
-                description = row[col]
+        # Complex sleep descriptions and cells listing several timed items
+        # become several events; their times are left without a date here
+        # and prefixed with the sheet date later.
+        split_events = None
+        if event_type == "sleep_note" and "sleep" in str(field).lower():
+            split_events = parse_complex_sleep(description, "")
+        elif event_type in SEGMENTED_TYPES:
+            split_events = segment_events(str(description), value_spans, event_type, subtype) or None
         
-        if pd.isna(field) and pd.isna(description):
-            continue
-            
-        # Extract times from description
-        times = extract_time_from_text(description, sheet_name)
-        if not times:
-            times = extract_time_from_text(field, sheet_name)
-        if not times:
-            times = [f"{sheet_name}T12:00"]  # Default time
+        # Extract numeric values; a lone running total is still the best figure
+        value, units = extract_numeric_values(description, event_type, value_spans)
+        if value is None and len(value_spans) < len(spans):
+            value, units = extract_numeric_values(description, event_type, spans)
+    
+    return times, event_type, subtype, notes, value, units, split_events
+
+def segment_events(description, spans, event_type, subtype):
+    """One event per clock-time segment of a compound cell, or [] if it has too few anchors"""
+    segments = split_segments(description, spans)
+    if len(segments) < MIN_ANCHORS:
+        return []
+    
+    events = []
+    for segment in segments:
+        notes = segment_text(description, segment)
+        event = {
+            "Time": f"T{segment.time}",
+            "Type": event_type,
+            "Subtype": subtype,
+            "Notes": notes
+        }
         
-        # Categorize the event
-        event_type, subtype, notes = categorize_event(field, description)
+        value, units = extract_numeric_values(notes, event_type, segment.spans)
+        if value is not None:
+            event["Value"] = value
+            event["Units"] = units
         
-        # Extract numeric values
-        value, units = extract_numeric_values(description, event_type)
+        events.append(event)
+    
+    return events
+
+def parse_sheet_rows(sheet_name, rows, profiler=NULL_PROFILER):
+    """Parse (field, description) row tuples from a single sheet into a daily log"""
+    
+    # Initialize daily log structure
+    daily_log = new_daily_log(sheet_name)
+    
+    def extract(field, description):
+        return extract_row(field, description, profiler)
+    
+    # Process each row
+    events = []
+    rows_of_events = []
+    for row, (field, description) in enumerate(rows):
+        times, event_type, subtype, notes, value, units, split_events = \
+            EXTRACTION_CACHE.get(field, description, extract)
         
         # Handle multiple events from complex descriptions
-        if event_type == "sleep_note" and "sleep" in str(field).lower():
-            # Parse complex sleep descriptions
-            sleep_events = parse_complex_sleep(description, sheet_name)
-            daily_log["TimelineEvents"].extend(sleep_events)
+        if split_events is not None:
+            for split_event in split_events:
+                events.append(TimelineEvent.create(
+                    sheet_name + split_event["Time"], split_event["Type"], split_event["Subtype"],
+                    split_event["Notes"], split_event.get("Value"), split_event.get("Units")))
+                rows_of_events.append(row)
         else:
             # Create single timeline event
-            event = {
-                "Time": times[0],
-                "Type": event_type,
-                "Subtype": subtype,
-                "Notes": notes
-            }
-            
-            if value is not None:
-                event["Value"] = value
-                event["Units"] = units
-            
-            daily_log["TimelineEvents"].append(event)
-    
-    # Calculate summary data
-    caffeine_total = 0
-    hydration_total = 0
-    stress_events = []
-    meals = []
-    medications = []
-    pain_episodes = []
-    sleep_times = {"Bed": "", "Wake": ""}
-    
-    for event in daily_log["TimelineEvents"]:
-        if event["Type"] == "caffeine" and "Value" in event:
-            caffeine_total += event["Value"]
-        elif event["Type"] == "hydration" and "Value" in event:
-            hydration_total += event["Value"]
-        elif event["Type"] == "stress" and "Value" in event:
-            stress_events.append(event["Value"])
-        elif event["Type"] == "meal":
-            time_part = event["Time"].split("T")[1] if "T" in event["Time"] else "12:00"
-            meals.append({
-                "Time": time_part,
-                "Skipped": False,
-                "Notes": event["Notes"]
-            })
-        elif event["Type"] in ["med", "supplement"] and "unisom" in event["Notes"].lower():
-            time_part = event["Time"].split("T")[1] if "T" in event["Time"] else "22:00"
-            medications.append({
-                "Time": time_part,
-                "Name": "Unisom",
-                "Dose": "12.5 mg"
-            })
-        elif event["Type"] == "pain" and "Value" in event:
-            pain_episodes.append({
-                "Start": event["Time"],
-                "Peak": event["Time"],
-                "End": None,
-                "Location": "General",
-                "Intensity": [event["Value"]],
-                "Notes": event["Notes"]
-            })
-        elif event["Type"] == "sleep_note":
-            if "bedtime" in event["Subtype"] or "bed" in event["Notes"].lower():
-                sleep_times["Bed"] = event["Time"].split("T")[1] if "T" in event["Time"] else "22:00"
-            elif "wake" in event["Subtype"] or "wake" in event["Notes"].lower():
-                sleep_times["Wake"] = event["Time"].split("T")[1] if "T" in event["Time"] else "06:00"
-    
-    # Update summary fields
-    daily_log["CaffeineMg"] = caffeine_total
-    daily_log["HydrationOz"] = hydration_total
-    daily_log["StressLevel"] = int(sum(stress_events) / len(stress_events)) if stress_events else None
-    daily_log["SleepWindow"] = sleep_times
-    daily_log["Meals"] = meals
-    daily_log["Medications"] = medications
-    daily_log["PainEpisodes"] = pain_episodes
-    
-    # Sort timeline events by time
-    daily_log["TimelineEvents"].sort(key=lambda x: x["Time"])
+            time = f"{sheet_name}T{times[0] if times else '12:00'}"  # Default time
+            events.append(TimelineEvent.create(time, event_type, subtype, notes, value,
+                                               units if value is not None else None))
+            rows_of_events.append(row)
+    
+    # The same event is often logged by two rows (e.g. the sleep cell and the
+    # wake-up row); items split out of one cell are never merged with each other
+    with profiler.stage("dedup"):
+        events, _ = merge_duplicates(events, groups=rows_of_events)
+    
+    with profiler.stage("aggregation"):
+        # Fold summary fields in event by event
+        summary = DaySummary()
+        for event in events:
+            summary.add(event)
+        summary.apply_to(daily_log)
+        
+        # Sort timeline events by time (integer minutes, stable)
+        events.sort(key=lambda event: event.minute)
+    
+    with profiler.stage("serialization"):
+        daily_log["TimelineEvents"] = [event.to_dict() for event in events]
     
     return daily_log
 
@@ -257,7 +215,7 @@ def parse_complex_sleep(description, date):
     desc_str = str(description).lower()
     
     # Extract bedtime
-    bedtime_match = re.search(r'in bed.*?(\d{1,2})\s*[:：]\s*(\d{2})', desc_str)
+    bedtime_match = _IN_BED_RE.search(desc_str)
     if bedtime_match:
         hour, minute = bedtime_match.groups()
         events.append({
@@ -268,7 +226,7 @@ def parse_complex_sleep(description, date):
         })
     
     # Extract asleep time
-    asleep_match = re.search(r'asleep.*?(\d{1,2})\s*[:：]\s*(\d{2})', desc_str)
+    asleep_match = _ASLEEP_RE.search(desc_str)
     if asleep_match:
         hour, minute = asleep_match.groups()
         events.append({
@@ -279,7 +237,7 @@ def parse_complex_sleep(description, date):
         })
     
     # Extract wake times
-    wake_matches = re.findall(r'(?:woke|awake|up).*?(\d{1,2})\s*[:：]\s*(\d{2})', desc_str)
+    wake_matches = _WOKE_RE.findall(desc_str)
     for i, (hour, minute) in enumerate(wake_matches):
         subtype = "restless_awake" if i < len(wake_matches) - 1 else "wake"
         events.append({
@@ -291,61 +249,377 @@ def parse_complex_sleep(description, date):
     
     return events
 
-def process_all_sheets():
-    """Process all sheets in the Excel file"""
-    
-    try:
-        xl_file = pd.ExcelFile('full_routine_journal.xlsx')
-        
-        print(f"🗂️ Found {len(xl_file.sheet_names)} sheets to process")
-        print(f"📅 Date range: {xl_file.sheet_names[-1]} to {xl_file.sheet_names[0]}")
-        
-        processed_count = 0
+def iter_sheet_rows(xl_file, profiler=NULL_PROFILER, failed=None):
+    """Yield (sheet_name, rows) for every non-empty sheet of an open workbook"""
+    for sheet_name in xl_file.sheet_names:
+        try:
+            with profiler.stage("sheet_read"):
+                df = xl_file.parse(sheet_name)
+            
+            # Skip empty sheets
+            if df.empty or df.dropna(how='all').empty:
+                print(f"⏭️ Skipping empty sheet: {sheet_name}")
+                profiler.sheet(sheet_name)["status"] = "empty"
+                continue
+            
+            with profiler.stage("row_extraction"):
+                rows = extract_rows(df)
+            profiler.sheet(sheet_name)["rows"] = len(rows)
+            yield sheet_name, rows
+            
+        except Exception as e:
+            print(f"❌ Error reading sheet '{sheet_name}': {e}")
+            profiler.record_error(sheet_name, e, "sheet_read")
+            if failed is not None:
+                failed.append(sheet_name)
+            continue
+
+def stream_sheets(workbook_path, profiler=NULL_PROFILER):
+    """Yield (sheet_name, rows) one sheet at a time from the read-only streaming reader"""
+    sheets = iter_workbook_sheets(workbook_path)
+    while True:
+        try:
+            with profiler.stage("sheet_read"):
+                sheet_name, rows = next(sheets)
+        except StopIteration:
+            return
+        except Exception as e:
+            # The stream cannot resume past a broken sheet
+            print(f"❌ Error reading workbook '{workbook_path}': {e}")
+            profiler.record_error(None, e, "sheet_read")
+            return
         
-        for sheet_name in xl_file.sheet_names:
+        profiler.sheet(sheet_name)["rows"] = len(rows)
+        yield sheet_name, rows
+
+def read_workbook_sheets(workbook_path, sheet_cache=None, profiler=NULL_PROFILER, streaming=False):
+    """(sheet_names, iterable of (sheet_name, rows)), from the sheet cache while the workbook is unchanged"""
+    if streaming:
+        # Only the current sheet's rows are held in memory, so the sheet
+        # cache (which needs every sheet) is neither read nor written.
+        with profiler.stage("workbook_open"):
+            sheet_names = workbook_sheet_names(workbook_path)
+        return sheet_names, stream_sheets(workbook_path, profiler)
+    
+    cached = sheet_cache.load() if sheet_cache else None
+    if cached is not None:
+        sheet_names, sheets = cached
+        print(f"⚡ Loaded {len(sheets)} sheets from the sheet cache")
+        for sheet_name, rows in sheets:
+            profiler.sheet(sheet_name)["rows"] = len(rows)
+        return sheet_names, sheets
+    
+    # pandas is imported only when a workbook is actually read
+    import pandas as pd
+    
+    with profiler.stage("workbook_open"):
+        xl_file = pd.ExcelFile(workbook_path)
+    
+    return xl_file.sheet_names, read_through(xl_file, sheet_cache, profiler)
+
+def read_through(xl_file, sheet_cache, profiler=NULL_PROFILER):
+    """Yield the workbook's sheets and refill the sheet cache once all were read cleanly"""
+    sheets = []
+    failed = []
+    with xl_file:
+        for sheet_name, rows in iter_sheet_rows(xl_file, profiler, failed):
+            if sheet_cache:
+                sheets.append((sheet_name, rows))
+            yield sheet_name, rows
+    
+    if sheet_cache and not failed:
+        sheet_cache.save(xl_file.sheet_names, sheets)
+
+def init_worker(cache_entries):
+    """Pool initializer: start each worker from the parent's extraction cache"""
+    EXTRACTION_CACHE.update(cache_entries)
+    EXTRACTION_CACHE.track_delta()
+
+def parse_sheet_profiled(sheet_name, rows):
+    """Worker entry point: parse one sheet and return its stage timings and cache delta with it"""
+    profiler = IngestProfiler()
+    daily_log = parse_sheet_rows(sheet_name, rows, profiler)
+    return daily_log, dict(profiler.stages), EXTRACTION_CACHE.take_delta()
+
+def parse_sheets(sheets, workers=1, profiler=NULL_PROFILER):
+    """Parse (sheet_name, rows) pairs, yielding (sheet_name, daily_log, error) in sheet order"""
+    if workers <= 1:
+        for sheet_name, rows in sheets:
             try:
-                # Skip empty sheets
-                df = pd.read_excel('full_routine_journal.xlsx', sheet_name=sheet_name)
+                yield sheet_name, parse_sheet_rows(sheet_name, rows, profiler), None
+            except Exception as e:
+                yield sheet_name, None, e
+        return
+    
+    # Only the raw row tuples cross the process boundary; each worker returns
+    # a finished daily log. Results are collected in submission order so the
+    # output matches a serial run, and at most two sheets per worker are in
+    # flight so a streamed workbook is not read ahead into memory. Workers
+    # start from the parent's extraction cache and send back the entries
+    # they added, so the cache is saved and reported as in a serial run.
+    def result(sheet_name, future):
+        try:
+            daily_log, stages, cache_delta = future.result()
+            profiler.merge_stages(stages)
+            EXTRACTION_CACHE.merge_delta(cache_delta)
+            return sheet_name, daily_log, None
+        except Exception as e:
+            return sheet_name, None, e
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(EXTRACTION_CACHE.entries(),)) as executor:
+        pending = deque()
+        for sheet_name, rows in sheets:
+            pending.append((sheet_name, executor.submit(parse_sheet_profiled, sheet_name, rows)))
+            if len(pending) >= workers * 2:
+                yield result(*pending.popleft())
+        while pending:
+            yield result(*pending.popleft())
+
+def daily_log_path(sheet_name):
+    """Path of the daily log JSON written for a sheet"""
+    return f"dataset/migraine_log_{sheet_name}.json"
+
+def sheet_hash(rows):
+    """Content hash of a sheet's (field, description) rows"""
+    return hashlib.sha256(repr(rows).encode('utf-8')).hexdigest()
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the ingest manifest recording per-sheet content hashes"""
+    if not os.path.exists(path):
+        return {"parser_version": PARSER_VERSION, "workbooks": {}}
+    
+    return load_file(path)
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Write the ingest manifest"""
+    dump_file(manifest, path, pretty=True)
+
+def prune_stale_outputs(manifest, previous, sheet_names):
+    """Delete outputs of sheets that no longer exist in the workbook"""
+    live_outputs = {
+        entry["output"]
+        for sheets in manifest["workbooks"].values()
+        for entry in sheets.values()
+    }
+    
+    removed = []
+    for sheet_name, entry in previous.items():
+        if sheet_name in sheet_names or entry["output"] in live_outputs:
+            continue
+        if os.path.exists(entry["output"]):
+            os.remove(entry["output"])
+            removed.append(entry["output"])
+    
+    return removed
+
+def process_all_sheets(workbook_path=WORKBOOK_PATH, workers=1, incremental=True,
+                       ndjson_path=None, ndjson_events=False, pretty=False,
+                       cache_path=EXTRACTION_CACHE_PATH, report_path=None, sheet_cache=True,
+                       streaming=False, sqlite_path=None):
+    """Process all sheets in the Excel file"""
+    
+    # Stage timings, per-sheet counters and errors; written to report_path
+    profiler = IngestProfiler()
+    
+    # Optional single NDJSON stream, appended to as each sheet finishes
+    stream = NdjsonWriter(ndjson_path, events=ndjson_events) if ndjson_path else None
+    
+    # Optional SQLite backend; each sheet is upserted in its own transaction
+    database = None
+    if sqlite_path:
+        from sqlite_store import SqliteStore
+        database = SqliteStore(sqlite_path)
+    
+    # With the stream on stdout ('-'), progress lines go to stderr so stdout
+    # carries nothing but NDJSON records
+    progress = redirect_stdout(sys.stderr) if ndjson_path == "-" else nullcontext()
+    with progress:
+        try:
+            # Open the workbook once; every sheet is parsed from this handle
+            # instead of re-reading the whole file per sheet. While the workbook
+            # is unchanged its rows come from the sheet cache and it is not opened.
+            sheet_names, sheets = read_workbook_sheets(
+                workbook_path, SheetCache(workbook_path) if sheet_cache else None, profiler, streaming)
+            
+            print(f"🗂️ Found {len(sheet_names)} sheets to process")
+            print(f"📅 Date range: {sheet_names[-1]} to {sheet_names[0]}")
+            
+            # Sheets whose rows hash the same as last run (under the same parser
+            # version) keep their existing output and are not re-parsed.
+            manifest = load_manifest()
+            workbook_key = os.path.normpath(workbook_path)
+            previous = manifest["workbooks"].get(workbook_key, {})
+            rebuild = not incremental or manifest.get("parser_version") != PARSER_VERSION
+            current = {}
+            skipped = []
+            
+            # Unchanged days still reach the NDJSON stream, and a database that is
+            # new (or missing some days), from their existing JSON, so
+            # incremental runs leave both complete
+            stored_dates = set(database.dates()) if database else set()
+            
+            def replay_stored(sheet_name, entry):
+                """Write a skipped sheet's stored output where needed; False if it must be re-parsed"""
+                upsert = database is not None and sheet_name not in stored_dates
+                if not stream and not upsert:
+                    return True
+                try:
+                    with profiler.stage("serialization"):
+                        daily_log = load_file(entry["output"])
+                        if stream:
+                            stream.write(daily_log)
+                        if upsert:
+                            database.upsert_day(daily_log)
+                except Exception as e:
+                    print(f"⚠️ Could not reuse {entry['output']}, re-parsing '{sheet_name}': {e}")
+                    return False
+                return True
+            
+            def changed_sheets():
+                for sheet_name, rows in sheets:
+                    digest = sheet_hash(rows)
+                    entry = previous.get(sheet_name)
+                    if (not rebuild and entry and entry["hash"] == digest
+                            and os.path.exists(entry["output"]) and replay_stored(sheet_name, entry)):
+                        current[sheet_name] = entry
+                        skipped.append(sheet_name)
+                        profiler.sheet(sheet_name)["status"] = "skipped"
+                        continue
+                    current[sheet_name] = {"hash": digest, "output": daily_log_path(sheet_name)}
+                    yield sheet_name, rows
+            
+            if cache_path:
+                EXTRACTION_CACHE.load(cache_path, PARSER_VERSION)
+            
+            processed_count = 0
+            
+            for sheet_name, daily_log, error in parse_sheets(changed_sheets(), workers, profiler):
+                print(f"\n📋 Processing sheet: {sheet_name}")
                 
-                if df.empty or df.dropna(how='all').empty:
-                    print(f"⏭️ Skipping empty sheet: {sheet_name}")
+                try:
+                    if error is not None:
+                        raise error
+                    
+                    # Save to JSON file
+                    filename = daily_log_path(sheet_name)
+                    os.makedirs("dataset", exist_ok=True)
+                    
+                    with profiler.stage("serialization"):
+                        dump_file(daily_log, filename, pretty=pretty)
+                        
+                        if stream:
+                            stream.write(daily_log)
+                        
+                        if database:
+                            database.upsert_day(daily_log)
+                    
+                    processed_count += 1
+                    counters = profiler.sheet(sheet_name)
+                    counters["events"] = len(daily_log["TimelineEvents"])
+                    counters["status"] = "written"
+                    
+                    print(f"✅ Created: {filename}")
+                    print(f"   📊 {len(daily_log['TimelineEvents'])} events | "
+                          f"☕ {daily_log['CaffeineMg']}mg caffeine | "
+                          f"💧 {daily_log['HydrationOz']}oz hydration | "
+                          f"🍽️ {len(daily_log['Meals'])} meals")
+                    
+                except Exception as e:
+                    print(f"❌ Error processing sheet '{sheet_name}': {e}")
+                    profiler.record_error(sheet_name, e, "parse")
+                    # Keep the old entry (if any) so the sheet is retried next run
+                    if sheet_name in previous:
+                        current[sheet_name] = previous[sheet_name]
+                    else:
+                        current.pop(sheet_name, None)
                     continue
-                
-                # Process the sheet
-                daily_log = parse_sheet_data(sheet_name, df)
-                
-                # Save to JSON file
-                filename = f"dataset/migraine_log_{sheet_name}.json"
-                os.makedirs("dataset", exist_ok=True)
-                
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(daily_log, f, indent=2, ensure_ascii=False)
-                
-                processed_count += 1
-                
-                print(f"✅ Created: {filename}")
-                print(f"   📊 {len(daily_log['TimelineEvents'])} events | "
-                      f"☕ {daily_log['CaffeineMg']}mg caffeine | "
-                      f"💧 {daily_log['HydrationOz']}oz hydration | "
-                      f"🍽️ {len(daily_log['Meals'])} meals")
-                
-            except Exception as e:
-                print(f"❌ Error processing sheet '{sheet_name}': {e}")
-                continue
-        
-        print(f"\n🎉 Successfully processed {processed_count} out of {len(xl_file.sheet_names)} sheets!")
+            
+            # Sheets that are still in the workbook but were not read this run
+            # (empty or unreadable) keep their previous entry.
+            for sheet_name in sheet_names:
+                if sheet_name not in current and sheet_name in previous:
+                    current[sheet_name] = previous[sheet_name]
+            
+            manifest["parser_version"] = PARSER_VERSION
+            manifest["workbooks"][workbook_key] = current
+            removed = prune_stale_outputs(manifest, previous, set(sheet_names))
+            save_manifest(manifest)
+            if cache_path:
+                EXTRACTION_CACHE.save(cache_path, PARSER_VERSION)
+            
+            print(f"\n🎉 Successfully processed {processed_count} out of {len(sheet_names)} sheets!")
+            if skipped:
+                print(f"⏩ {len(skipped)} unchanged sheets skipped")
+            for filename in removed:
+                print(f"🧹 Removed stale: {filename}")
+            cache_stats = EXTRACTION_CACHE.stats()
+            print(f"🧠 Extraction cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+            
+            # List all created files
+            print(f"\n📁 Created files in dataset/:")
+            for sheet_name in sheet_names:
+                filename = f"migraine_log_{sheet_name}.json"
+                if os.path.exists(f"dataset/{filename}"):
+                    print(f"   ✓ {filename}")
+            
+        except Exception as e:
+            print(f"❌ Error processing Excel file: {e}")
+            profiler.record_error(None, e, "ingest")
+            import traceback
+            traceback.print_exc()
         
-        # List all created files
-        print(f"\n📁 Created files in dataset/:")
-        for sheet_name in xl_file.sheet_names:
-            filename = f"migraine_log_{sheet_name}.json"
-            if os.path.exists(f"dataset/{filename}"):
-                print(f"   ✓ {filename}")
+        finally:
+            if stream:
+                stream.close()
+            if database:
+                database.close()
+            
+            if report_path:
+                profiler.write_report(report_path, workbook=workbook_path, parser_version=PARSER_VERSION,
+                                      workers=workers, cache=EXTRACTION_CACHE.stats())
+                print(f"⏱️ Wrote ingest report: {report_path}")
         
-    except Exception as e:
-        print(f"❌ Error processing Excel file: {e}")
-        import traceback
-        traceback.print_exc()
+    return profiler
 
 if __name__ == "__main__":
-    process_all_sheets() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Convert every sheet of the routine journal into daily logs")
+    parser.add_argument("--workbook", default=WORKBOOK_PATH, help="path to the journal workbook")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="parse sheets across N worker processes (default: serial)")
+    parser.add_argument("--full", action="store_true",
+                        help="re-parse every sheet instead of only those changed since the last run")
+    parser.add_argument("--ndjson", metavar="PATH",
+                        help="also append each daily log as one line to this NDJSON file "
+                             "('-' for stdout; progress lines then go to stderr)")
+    parser.add_argument("--ndjson-events", action="store_true",
+                        help="write one NDJSON line per timeline event instead of per daily log")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="do not load or save the on-disk extraction cache")
+    parser.add_argument("--pretty", action="store_true",
+                        help="indent the daily log JSON files for reading (default: compact)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="read the workbook row by row in openpyxl read-only mode; memory stays flat "
+                             "for very large workbooks (bypasses the sheet cache)")
+    parser.add_argument("--no-sheet-cache", action="store_true",
+                        help="always read the xlsx instead of reusing rows cached from an unchanged workbook")
+    parser.add_argument("--sqlite", metavar="PATH", nargs="?", const="dataset/migraine_logs.sqlite3",
+                        help="also upsert each daily log into a SQLite database "
+                             "(default path: dataset/migraine_logs.sqlite3)")
+    parser.add_argument("--report", metavar="PATH",
+                        help="write per-stage timings, per-sheet counters and errors as JSON")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"],
+                        help="run the ingest under a code profiler (parent process only)")
+    parser.add_argument("--profile-out", metavar="PATH", default="ingest.prof",
+                        help="where to save the profiler output (default: ingest.prof)")
+    args = parser.parse_args()
+    
+    with code_profiler(args.profile, args.profile_out):
+        process_all_sheets(args.workbook, workers=args.workers, incremental=not args.full,
+                           ndjson_path=args.ndjson, ndjson_events=args.ndjson_events,
+                           pretty=args.pretty,
+                           cache_path=None if args.no_cache else EXTRACTION_CACHE_PATH,
+                           report_path=args.report, sheet_cache=not args.no_sheet_cache,
+                           streaming=args.streaming, sqlite_path=args.sqlite)
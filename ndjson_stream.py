@@ -0,0 +1,64 @@
+import sys
+import time
+
+from serialization import dumps, loads
+
+def flatten_events(daily_log):
+    """TimelineEvents of a daily log, each tagged with its Date"""
+    for event in daily_log["TimelineEvents"]:
+        yield {"Date": daily_log["Date"], **event}
+
+def dumps_line(record):
+    """One compact JSON line"""
+    return dumps(record) + "\n"
+
+class NdjsonWriter:
+    """Append finished daily logs, or their flattened events, to one NDJSON stream.
+
+    Every record is written and flushed as soon as its sheet is done, so
+    `tail -f` (or follow()) sees days arrive during a run. The stream is
+    append-only: when a day is re-ingested its newer line supersedes the old.
+    """
+
+    def __init__(self, path, events=False):
+        self.path = path
+        self.events = events
+        self._file = sys.stdout if path == "-" else open(path, 'a', encoding='utf-8')
+
+    def write(self, daily_log):
+        records = flatten_events(daily_log) if self.events else [daily_log]
+        self._file.write("".join(dumps_line(record) for record in records))
+        self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_ndjson(path):
+    """Yield records from an NDJSON file one line at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+def follow(path, poll_seconds=0.5):
+    """Yield records from an NDJSON file forever, waiting for new lines like tail -f"""
+    with open(path, 'r', encoding='utf-8') as f:
+        pending = ""
+        while True:
+            line = f.readline()
+            if not line:
+                time.sleep(poll_seconds)
+                continue
+            pending += line
+            # A writer may be mid-line; wait for the newline before decoding
+            if pending.endswith("\n"):
+                if pending.strip():
+                    yield loads(pending)
+                pending = ""
@@ -0,0 +1,110 @@
+import re
+from collections import namedtuple
+
+from text_extractor import QUANTITY, TIME
+
+# Types whose cells often list several timed items ("06 : 05 16 oz water ...
+# 08 : 30 Bottle #1 32 oz ..."); each item becomes its own TimelineEvent
+SEGMENTED_TYPES = frozenset({"hydration", "meal", "supplement", "bodycare"})
+
+# A cell is only split when it has at least this many anchors
+MIN_ANCHORS = 2
+
+Segment = namedtuple("Segment", ["time", "start", "end", "spans"])
+
+# What may sit between the two ends of a range such as "12 : 30–13 : 00"
+_RANGE_GAP_RE = re.compile(r'\s*(?:[-–—]|to)\s*', re.IGNORECASE)
+
+# Only this many characters before a span are looked at for the words around
+# it, so each span costs the same however long the description is
+_LOOKBACK = 24
+
+# A clock time right after one of these marks progress on the item before it
+# ("16 oz down by 07 : 10", "→ finished 06 : 52", "(05 : 40)") instead of starting a new item
+_PROGRESS_RE = re.compile(r'(?:\bby|\buntil|\btill|\bsince|\bat|\bopened|\bfinished|\(|@)\s*[~≈]?\s*$',
+                          re.IGNORECASE)
+
+# A capitalized label in front of an anchor ("Lunch 11 :45", "Evening ~19 : 45")
+# starts its segment rather than ending the previous one
+_LABEL_RE = re.compile(r'\b[A-Z][a-z]+[\s~≈@]*$')
+
+# Quantities that restate what the other items add up to: "Total fluids ≈ 80 oz",
+# "≈ 92 oz total fluids"
+_TOTAL_BEFORE_RE = re.compile(r'\b(?:total|cumulative)\b[^\d()]*$', re.IGNORECASE)
+_TOTAL_AFTER_RE = re.compile(r'\s*(?:total|cumulative)\b', re.IGNORECASE)
+
+# A quantity followed by one of these is how far along the item before it is
+# ("16 oz down by 07 : 10"), not a new amount
+_PROGRESS_AFTER_RE = re.compile(r'\s*(?:(?:down|drunk|gone)\s*)?(?:by|until|till)\b', re.IGNORECASE)
+
+def drop_running_totals(text, spans):
+    """Spans without the quantities a description gives as a running total or as progress.
+
+    A quantity counts as a total when "total"/"cumulative" comes shortly
+    before it with no number or bracket in between, or right after it. A
+    quantity right before a progress marker ("16 oz down by 07 : 10") is
+    progress on the item before it, and is dropped when a quantity in the
+    same unit has already been kept since the last anchor.
+    """
+    kept = []
+    measured = set()
+    previous_end = 0
+    for span in spans:
+        before = max(previous_end, span.start - _LOOKBACK)
+        if span.kind == TIME and not _PROGRESS_RE.search(text, before, span.start):
+            # A new item starts; nothing is measured in it yet
+            measured.clear()
+        elif span.kind == QUANTITY:
+            if (_TOTAL_BEFORE_RE.search(text, before, span.start) or _TOTAL_AFTER_RE.match(text, span.end)
+                    or (span.unit in measured and _PROGRESS_AFTER_RE.match(text, span.end))):
+                previous_end = span.end
+                continue
+            measured.add(span.unit)
+        kept.append(span)
+        previous_end = span.end
+    return kept
+
+def split_segments(text, spans):
+    """Cut a description at its clock-time anchors, in one walk over its spans.
+
+    Every clock time starts a new Segment except the end of a range (which
+    stays part of the anchor it closes) and a time that marks progress on
+    the previous item. A segment starts at its anchor's label, if any, and
+    text before the first anchor belongs to the first segment. Returns
+    [Segment(time, start, end, spans)] covering the text.
+    """
+    segments = []
+    previous = None
+    for span in spans:
+        if span.kind == TIME:
+            gap_start = previous.end if previous is not None else 0
+            if segments and previous.kind == TIME and _RANGE_GAP_RE.fullmatch(text, gap_start, span.start):
+                segments[-1].spans.append(span)
+                previous = span
+                continue
+            before = max(gap_start, span.start - _LOOKBACK)
+            if not _PROGRESS_RE.search(text, before, span.start):
+                label = _LABEL_RE.search(text, before, span.start)
+                segments.append(Segment(span.value, label.start() if label else span.start, None, [span]))
+                previous = span
+                continue
+
+        if segments:
+            segments[-1].spans.append(span)
+        previous = span
+
+    if not segments:
+        return []
+
+    # Close each segment where the next one starts; the first one takes the
+    # text (and spans) before its anchor
+    leading = [span for span in spans if span.end <= segments[0].start]
+    segments[0] = segments[0]._replace(start=0, spans=leading + segments[0].spans)
+    for i in range(len(segments) - 1):
+        segments[i] = segments[i]._replace(end=segments[i + 1].start)
+    segments[-1] = segments[-1]._replace(end=len(text))
+    return segments
+
+def segment_text(text, segment):
+    """A segment's text without the bullets and arrows that joined it to its neighbours"""
+    return text[segment.start:segment.end].strip(" \t\n•·→;,").rstrip(" ~≈")
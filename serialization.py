@@ -0,0 +1,56 @@
+import json
+
+# Fastest available JSON backend: orjson, then msgspec, then the stdlib.
+# Output is compact unless pretty=True, which keeps the 2-space indent of the
+# historical dataset files for debugging.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "json"
+
+def dumps_bytes(obj, pretty=False):
+    """Serialize obj to UTF-8 JSON bytes"""
+    if BACKEND == "orjson":
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if BACKEND == "msgspec":
+        data = msgspec.json.encode(obj)
+        return msgspec.json.format(data, indent=2) if pretty else data
+    return dumps(obj, pretty).encode('utf-8')
+
+def dumps(obj, pretty=False):
+    """Serialize obj to a JSON string"""
+    if BACKEND != "json":
+        return dumps_bytes(obj, pretty).decode('utf-8')
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    if BACKEND == "msgspec":
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+def dump_file(obj, path, pretty=False):
+    """Write obj as JSON to path"""
+    with open(path, 'wb') as f:
+        f.write(dumps_bytes(obj, pretty))
+
+def load_file(path):
+    """Read a JSON file through the fast decoder"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
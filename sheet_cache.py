@@ -0,0 +1,59 @@
+import hashlib
+import os
+import pickle
+
+SHEET_CACHE_DIR = ".ingest_cache/sheets"
+
+# Bump when the cached row format (what extract_rows returns) changes
+SHEET_CACHE_VERSION = 1
+
+def workbook_stamp(path):
+    """(mtime_ns, size) of a workbook; any edit to the xlsx changes it"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+class SheetCache:
+    """Pickled (field, description) rows of a workbook's sheets.
+
+    Reading the xlsx through openpyxl dominates every run, so the rows each
+    parser pulls out of it are kept under .ingest_cache and reused while the
+    workbook's mtime and size are unchanged. columns is the parser's column
+    selection and is part of the key, so parsers reading different columns
+    of the same workbook keep separate entries.
+    """
+
+    def __init__(self, workbook_path, columns=None, cache_dir=SHEET_CACHE_DIR):
+        self.workbook_path = workbook_path
+        self.columns = columns
+        key = f"{os.path.abspath(workbook_path)}|{columns!r}"
+        self.path = os.path.join(cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".pkl")
+        self.stamp = None
+
+    def load(self):
+        """(sheet_names, [(sheet_name, rows), ...]) if the cache matches the workbook, else None"""
+        # Stamp before the caller falls back to reading the workbook, so an
+        # edit made during that read leaves the saved entry stale
+        self.stamp = workbook_stamp(self.workbook_path)
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if data.get("version") != SHEET_CACHE_VERSION or data.get("stamp") != self.stamp:
+            return None
+        return data["sheet_names"], data["sheets"]
+
+    def save(self, sheet_names, sheets):
+        """Store the rows read from the workbook, stamped as of the last load()"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                "version": SHEET_CACHE_VERSION,
+                "stamp": self.stamp or workbook_stamp(self.workbook_path),
+                "sheet_names": list(sheet_names),
+                "sheets": list(sheets),
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,121 @@
+from itertools import groupby
+from operator import itemgetter
+
+# Cell text read_excel treats as missing by default; the streaming reader
+# maps these (and empty cells) to NaN so both readers give the parsers the
+# same values.
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+_MISSING = float("nan")
+
+def is_missing(value):
+    """pd.isna for a single cell value (None, NaN or NaT) without importing pandas"""
+    if value is None:
+        return True
+    try:
+        # NaN and NaT are the only cell values unequal to themselves
+        return bool(value != value)
+    except (TypeError, ValueError):
+        return False
+
+def resolve_columns(columns, field_column=None, description_column=None):
+    """Resolve the Field and description columns of a sheet once"""
+    # Same rule the per-row scan used: the field column is the last one whose
+    # name contains 'field', the description is the last of the others.
+    if field_column is None and description_column is None:
+        for col in columns:
+            if 'field' in str(col).lower():
+                field_column = col
+            else:
+                description_column = col
+    
+    if field_column not in columns:
+        field_column = None
+    if description_column not in columns:
+        description_column = None
+    
+    return field_column, description_column
+
+def extract_rows(df, field_column=None, description_column=None):
+    """Pull a sheet's (field, description) pairs out as plain tuples"""
+    field_column, description_column = resolve_columns(df.columns, field_column, description_column)
+    
+    # Drop all-NaN rows in one pass, then rows missing both field and description
+    df = df.dropna(how='all')
+    used = [col for col in (field_column, description_column) if col is not None]
+    if not used:
+        return []
+    df = df[df[used].notna().any(axis=1)]
+    
+    fields = df[field_column].tolist() if field_column is not None else [None] * len(df)
+    descriptions = df[description_column].tolist() if description_column is not None else [None] * len(df)
+    
+    return list(zip(fields, descriptions))
+
+def _cell(row, index):
+    """Value of one cell of a values_only row, NaN when missing"""
+    if index is None or index >= len(row):
+        return _MISSING
+    value = row[index]
+    if value is None or (isinstance(value, str) and value in NA_STRINGS):
+        return _MISSING
+    return value
+
+def _last_index(columns, column):
+    """Position of the last header equal to column (resolve_columns picks the last match)"""
+    if column is None:
+        return None
+    return len(columns) - 1 - columns[::-1].index(column)
+
+def workbook_sheet_names(path):
+    """Sheet names of a workbook, without reading any sheet"""
+    import openpyxl
+    
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return wb.sheetnames
+    finally:
+        wb.close()
+
+def iter_workbook_rows(path):
+    """Stream (sheet_name, field, description) for every non-empty row of a workbook.
+    
+    Uses openpyxl's read-only mode, which parses the sheet XML as it goes
+    instead of building the workbook DOM or a DataFrame, so memory stays flat
+    however large the workbook is. The first row of each sheet is its header
+    and picks the columns as extract_rows would.
+    """
+    import openpyxl
+    
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            
+            # Rows are padded to the sheet's width; drop unnamed trailing columns
+            columns = list(header)
+            while columns and columns[-1] is None:
+                columns.pop()
+            field_column, description_column = resolve_columns(columns)
+            field_index = _last_index(columns, field_column)
+            description_index = _last_index(columns, description_column)
+            
+            for row in rows:
+                field = _cell(row, field_index)
+                description = _cell(row, description_index)
+                if field is _MISSING and description is _MISSING:
+                    continue
+                yield ws.title, field, description
+    finally:
+        wb.close()
+
+def iter_workbook_sheets(path):
+    """Stream (sheet_name, rows) one sheet at a time from iter_workbook_rows"""
+    for sheet_name, group in groupby(iter_workbook_rows(path), key=itemgetter(0)):
+        yield sheet_name, [(field, description) for _, field, description in group]
@@ -0,0 +1,217 @@
+import os
+import sqlite3
+
+from serialization import dump_file, dumps, load_file, loads
+
+SQLITE_PATH = "dataset/migraine_logs.sqlite3"
+
+# Source names for the two parsers; a date can have one day row per source
+WORKBOOK_SOURCE = "workbook"
+EXCEL_JOURNAL_SOURCE = "excel_journal"
+
+# File name suffix each source's days have always been written with
+EXPORT_SUFFIXES = {WORKBOOK_SOURCE: "", EXCEL_JOURNAL_SOURCE: "_from_excel"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    caffeine_mg REAL,
+    hydration_oz REAL,
+    stress_level INTEGER,
+    sleep_bed TEXT,
+    sleep_wake TEXT,
+    fields TEXT NOT NULL,
+    UNIQUE (date, source)
+);
+CREATE INDEX IF NOT EXISTS days_date ON days (date);
+
+CREATE TABLE IF NOT EXISTS events (
+    day_id INTEGER NOT NULL REFERENCES days (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    time TEXT NOT NULL,
+    type TEXT NOT NULL,
+    subtype TEXT,
+    value,
+    units TEXT,
+    notes TEXT,
+    extra TEXT,
+    PRIMARY KEY (day_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS events_type_time ON events (type, time);
+CREATE INDEX IF NOT EXISTS events_subtype ON events (subtype);
+CREATE INDEX IF NOT EXISTS events_time ON events (time);
+"""
+
+_EVENT_KEYS = ("Time", "Type", "Subtype", "Value", "Units", "Notes")
+
+def _event_row(day_id, seq, event):
+    extra = {key: value for key, value in event.items() if key not in _EVENT_KEYS}
+    return (day_id, seq, event["Time"], event["Type"], event.get("Subtype"), event.get("Value"),
+            event.get("Units"), event.get("Notes"), dumps(extra) if extra else None)
+
+def _event_dict(time, type, subtype, value, units, notes, extra):
+    """TimelineEvent dict; columns that are NULL are left out as they were in the JSON"""
+    event = {"Time": time, "Type": type}
+    if subtype is not None:
+        event["Subtype"] = subtype
+    if notes is not None:
+        event["Notes"] = notes
+    if value is not None:
+        event["Value"] = value
+    if units is not None:
+        event["Units"] = units
+    if extra:
+        event.update(loads(extra))
+    return event
+
+class SqliteStore:
+    """Daily logs in SQLite: a days table and an indexed events table.
+
+    Each day's summary fields are kept as JSON (plus a few numeric columns
+    for SQL aggregates) and its TimelineEvents as one row each, indexed by
+    (type, time) and subtype. The database runs in WAL mode so readers are
+    not blocked while a sheet is written, and every day is written in one
+    transaction with executemany upserts.
+    """
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def upsert_day(self, daily_log, source=WORKBOOK_SOURCE):
+        """Insert or replace one daily log in a single transaction"""
+        fields = {key: value for key, value in daily_log.items() if key not in ("Date", "TimelineEvents")}
+        sleep_window = daily_log.get("SleepWindow") or {}
+        events = daily_log.get("TimelineEvents", [])
+
+        with self.connection:
+            day_id = self.connection.execute(
+                """INSERT INTO days (date, source, caffeine_mg, hydration_oz, stress_level,
+                                     sleep_bed, sleep_wake, fields)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (date, source) DO UPDATE SET
+                       caffeine_mg = excluded.caffeine_mg, hydration_oz = excluded.hydration_oz,
+                       stress_level = excluded.stress_level, sleep_bed = excluded.sleep_bed,
+                       sleep_wake = excluded.sleep_wake, fields = excluded.fields
+                   RETURNING id""",
+                (daily_log["Date"], source, daily_log.get("CaffeineMg"), daily_log.get("HydrationOz"),
+                 daily_log.get("StressLevel"), sleep_window.get("Bed") or None,
+                 sleep_window.get("Wake") or None, dumps(fields)),
+            ).fetchone()[0]
+
+            self.connection.executemany(
+                """INSERT INTO events (day_id, seq, time, type, subtype, value, units, notes, extra)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (day_id, seq) DO UPDATE SET
+                       time = excluded.time, type = excluded.type, subtype = excluded.subtype,
+                       value = excluded.value, units = excluded.units, notes = excluded.notes,
+                       extra = excluded.extra""",
+                [_event_row(day_id, seq, event) for seq, event in enumerate(events)],
+            )
+            # The day may have had more events before
+            self.connection.execute("DELETE FROM events WHERE day_id = ? AND seq >= ?", (day_id, len(events)))
+        return day_id
+
+    def upsert_file(self, path, source=WORKBOOK_SOURCE):
+        """Upsert a daily log JSON file that is already in dataset/"""
+        return self.upsert_day(load_file(path), source)
+
+    def has_day(self, date, source=WORKBOOK_SOURCE):
+        """True if the date has a day row for the source"""
+        return self.connection.execute(
+            "SELECT 1 FROM days WHERE date = ? AND source = ?", (date, source)).fetchone() is not None
+
+    def dates(self, source=WORKBOOK_SOURCE):
+        """Stored dates for a source, oldest first"""
+        rows = self.connection.execute("SELECT date FROM days WHERE source = ? ORDER BY date", (source,))
+        return [date for date, in rows]
+
+    def export_day(self, date, source=WORKBOOK_SOURCE):
+        """One day back as a daily log dict in the system_prompt.md §5 schema, or None"""
+        row = self.connection.execute(
+            "SELECT id, fields FROM days WHERE date = ? AND source = ?", (date, source)).fetchone()
+        if row is None:
+            return None
+        day_id, fields = row
+        events = self.connection.execute(
+            """SELECT time, type, subtype, value, units, notes, extra FROM events
+               WHERE day_id = ? ORDER BY seq""", (day_id,))
+        daily_log = {"Date": date, "TimelineEvents": [_event_dict(*event) for event in events]}
+        daily_log.update(loads(fields))
+        return daily_log
+
+    def export_json(self, dataset_dir="dataset", source=WORKBOOK_SOURCE, dates=None, pretty=False):
+        """Write stored days as dataset/migraine_log_<date>.json files; returns the paths"""
+        suffix = EXPORT_SUFFIXES.get(source, f"_{source}")
+        os.makedirs(dataset_dir, exist_ok=True)
+        written = []
+        for date in dates or self.dates(source):
+            daily_log = self.export_day(date, source)
+            if daily_log is None:
+                continue
+            path = os.path.join(dataset_dir, f"migraine_log_{date}{suffix}.json")
+            dump_file(daily_log, path, pretty=pretty)
+            written.append(path)
+        return written
+
+    def events_between(self, start, end, type=None, source=WORKBOOK_SOURCE):
+        """TimelineEvent dicts with start <= Time < end (ISO strings), optionally of one Type"""
+        query = """SELECT e.time, e.type, e.subtype, e.value, e.units, e.notes, e.extra
+                   FROM events e JOIN days d ON d.id = e.day_id
+                   WHERE d.source = ? AND e.time >= ? AND e.time < ?"""
+        params = [source, start, end]
+        if type is not None:
+            query += " AND e.type = ?"
+            params.append(type)
+        rows = self.connection.execute(query + " ORDER BY e.time, e.day_id, e.seq", params)
+        return [_event_dict(*row) for row in rows]
+
+    def daily_totals(self, type, start=None, end=None, source=WORKBOOK_SOURCE):
+        """[(date, total Value, event count)] per day for one Type"""
+        query = """SELECT d.date, TOTAL(e.value), COUNT(*) FROM events e JOIN days d ON d.id = e.day_id
+                   WHERE d.source = ? AND e.type = ?"""
+        params = [source, type]
+        if start is not None:
+            query += " AND d.date >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND d.date < ?"
+            params.append(end)
+        return self.connection.execute(query + " GROUP BY d.date ORDER BY d.date", params).fetchall()
+
+    def by_hour(self, type, source=WORKBOOK_SOURCE):
+        """[(hour, mean Value, event count)] for one Type's valued events"""
+        return self.connection.execute(
+            """SELECT CAST(substr(e.time, 12, 2) AS INTEGER) AS hour, AVG(e.value), COUNT(*)
+               FROM events e JOIN days d ON d.id = e.day_id
+               WHERE d.source = ? AND e.type = ? AND e.value IS NOT NULL
+               GROUP BY hour ORDER BY hour""", (source, type)).fetchall()
+
+    def summary(self, start=None, end=None, source=WORKBOOK_SOURCE):
+        """Per-day summary columns [(date, caffeine_mg, hydration_oz, stress_level, bed, wake)]"""
+        query = """SELECT date, caffeine_mg, hydration_oz, stress_level, sleep_bed, sleep_wake
+                   FROM days WHERE source = ?"""
+        params = [source]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND date < ?"
+            params.append(end)
+        return self.connection.execute(query + " ORDER BY date", params).fetchall()
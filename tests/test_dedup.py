@@ -0,0 +1,91 @@
+"""Behaviour tests for dedup: time buckets, exempt events and source priority."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dedup import consolidate_dataset, day_files, merge_duplicates
+from event_model import TimelineEvent
+from serialization import dump_file, load_file
+
+DATE = "2025-07-01"
+
+
+def event(hhmm, type_name="hydration", subtype="water", notes=None, value=16, units="oz"):
+    return TimelineEvent.create(f"{DATE}T{hhmm}", type_name, subtype, notes, value, units)
+
+
+def test_same_bucket_merges():
+    merged, removed = merge_duplicates([event("05:25", notes="bottle"), event("05:29", notes="refill")])
+    assert removed == 1
+    assert merged[0].hhmm == "05:25"
+    assert merged[0].notes == "bottle; refill"
+
+
+def test_bucket_boundary_keeps_events_apart():
+    # 05:24 is the last minute of the 05:20 bucket, 05:25 the first of the next
+    merged, removed = merge_duplicates([event("05:24"), event("05:25")])
+    assert removed == 0
+    assert [e.hhmm for e in merged] == ["05:24", "05:25"]
+
+
+def test_different_value_in_same_bucket_is_kept():
+    merged, removed = merge_duplicates([event("05:25", value=16), event("05:26", value=8)])
+    assert removed == 0
+
+
+def test_untimed_events_only_merge_exact_copies():
+    # Rows without a clock time are stamped at noon
+    merged, removed = merge_duplicates([event("12:00", notes="with lunch"), event("12:00", notes="afternoon")])
+    assert removed == 0
+
+    merged, removed = merge_duplicates([event("12:00", notes="with lunch"), event("12:00", notes="With lunch.")])
+    assert removed == 1
+
+
+def test_notes_only_merge_exact_copies():
+    notes = [event("08:00", "note", "general", "Fog lifting", None, None),
+             event("08:01", "note", "general", "Fog lifting", None, None),
+             event("08:00", "note", "general", "Neck tight", None, None),
+             event("08:00", "note", "general", "Fog lifting", None, None)]
+    merged, removed = merge_duplicates(notes)
+    assert removed == 1
+    assert [(e.hhmm, e.notes) for e in merged] == [("08:00", "Fog lifting"), ("08:01", "Fog lifting"),
+                                                   ("08:00", "Neck tight")]
+
+
+def test_groups_keep_a_rows_own_events_apart():
+    # Two identical split events from one row stay; a second copy of the row merges into them
+    events = [event("07:05"), event("07:06"), event("07:05"), event("07:06")]
+    merged, removed = merge_duplicates(events, groups=[0, 0, 1, 1])
+    assert removed == 2
+    assert [e.hhmm for e in merged] == ["07:05", "07:06"]
+
+
+def write_day(directory, suffix, notes, **fields):
+    daily_log = {"Date": DATE, "TimelineEvents": [
+        {"Time": f"{DATE}T07:05", "Type": "hydration", "Subtype": "water", "Notes": notes,
+         "Value": 30, "Units": "oz"}], **fields}
+    dump_file(daily_log, os.path.join(directory, f"migraine_log_{DATE}{suffix}"))
+
+
+def test_source_priority(tmp_path):
+    write_day(tmp_path, "_from_excel.json", "from excel", HydrationOz=99, Notes="excel")
+    write_day(tmp_path, "", "hand copy", HydrationOz=98, Notes="hand")
+    write_day(tmp_path, ".json", "canonical", HydrationOz=30, Notes="")
+
+    paths = day_files(str(tmp_path))[DATE]
+    assert [os.path.basename(path) for path in paths] == [
+        f"migraine_log_{DATE}.json", f"migraine_log_{DATE}", f"migraine_log_{DATE}_from_excel.json"]
+
+    report = consolidate_dataset(str(tmp_path))
+    assert report[DATE][1:] == (3, 1)
+
+    consolidated = load_file(os.path.join(tmp_path, f"migraine_log_{DATE}.json"))
+    assert consolidated["HydrationOz"] == 30
+    # Empty summary fields are filled from the next copy that has them
+    assert consolidated["Notes"] == "hand"
+    assert consolidated["TimelineEvents"] == [
+        {"Time": f"{DATE}T07:05", "Type": "hydration", "Subtype": "water",
+         "Notes": "canonical; hand copy; from excel", "Value": 30, "Units": "oz"}]
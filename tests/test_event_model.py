@@ -0,0 +1,30 @@
+"""Behaviour tests for TimelineEvent time parsing and ordering."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from event_model import DailyLog, TimelineEvent
+from multi_day_excel_parser import parse_sheet_rows
+
+
+def test_iso_time_round_trips():
+    event = TimelineEvent.create("2025-07-01T07:05", "hydration", "water")
+    assert event.time_text is None
+    assert event.time == "2025-07-01T07:05"
+    assert event.hhmm == "07:05"
+
+
+def test_non_iso_times_sort_by_time_of_day():
+    times = ["Sheet1T18:30", "Sheet1T07:00", "Sheet1T12:15"]
+    day = DailyLog("Sheet1", [TimelineEvent.create(time, "note", "general") for time in times])
+    day.sort()
+    assert [event.time for event in day.events] == ["Sheet1T07:00", "Sheet1T12:15", "Sheet1T18:30"]
+
+
+def test_sheet_not_named_as_a_date_is_in_time_order():
+    daily_log = parse_sheet_rows("Sheet1", [("Dinner", "18 : 30 soup"), ("Breakfast", "07 : 00 oats"),
+                                            ("Lunch", "12 : 15 salad")])
+    assert [event["Time"] for event in daily_log["TimelineEvents"]] == [
+        "Sheet1T07:00", "Sheet1T12:15", "Sheet1T18:30"]
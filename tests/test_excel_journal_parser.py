@@ -0,0 +1,32 @@
+"""Behaviour tests for the Excel journal parser's field handlers."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from excel_journal_parser import parse_field_entry
+
+
+def summary(events):
+    return [(event["Type"], event["Subtype"], event.get("Value")) for event in events]
+
+
+def test_unknown_medication_row_is_kept():
+    events = parse_field_entry("Meds", "13 : 40 Ubrogepant 50 mg for right-temple pain")
+    assert summary(events) == [("supplement", "general", 50.0)]
+    assert events[0]["Time"] == "2025-07-01T13:40"
+
+
+def test_coffee_and_meds_row_keeps_its_caffeine():
+    events = parse_field_entry("Coffee + meds", "07 : 00 pour-over 95 mg")
+    assert summary(events) == [("caffeine", "pour_over_coffee", 95.0)]
+
+
+def test_known_supplements_are_listed():
+    events = parse_field_entry("Supplements", "riboflavin + magnesium")
+    assert summary(events) == [("supplement", "Riboflavin", 400), ("supplement", "Magnesium glycinate", 135)]
+
+
+def test_bodycare_subtype_comes_from_the_keyword_table():
+    assert summary(parse_field_entry("Stretch", "neck stretches")) == [("bodycare", "therapy", None)]
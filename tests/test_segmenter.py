@@ -0,0 +1,66 @@
+"""Behaviour tests for splitting compound cells into per-time events."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from multi_day_excel_parser import parse_sheet_rows
+from segmenter import drop_running_totals, split_segments
+from text_extractor import tokenize
+
+DATE = "2025-07-01"
+
+
+def parse_row(field, description):
+    return parse_sheet_rows(DATE, [(field, description)])
+
+
+def timeline(daily_log):
+    """(HH:MM, Value, Units) per event"""
+    return [(event["Time"][11:], event.get("Value"), event.get("Units")) for event in daily_log["TimelineEvents"]]
+
+
+def test_hydration_row_is_split_per_time():
+    daily_log = parse_row("Hydration", "07 : 05 Bottle #1 30 oz water → 08 : 00 16 oz electrolyte water")
+    assert timeline(daily_log) == [("07:05", 30, "oz"), ("08:00", 16, "oz")]
+    assert daily_log["HydrationOz"] == 46
+
+
+def test_running_total_is_not_counted():
+    text = "07 : 05 Bottle #1 30 oz → 08 : 00 16 oz water • Total fluids ≈ 46 oz"
+    daily_log = parse_row("Hydration", text)
+    assert timeline(daily_log) == [("07:05", 30, "oz"), ("08:00", 16, "oz")]
+    assert daily_log["HydrationOz"] == 46
+
+
+def test_progress_does_not_split_or_count_twice():
+    text = "07 : 05 Bottle #1 30 oz, 16 oz down by 07 : 40, finished 08 : 10"
+    assert len(split_segments(text, tokenize(text))) == 1
+    assert timeline(parse_row("Hydration", text)) == [("07:05", 30, "oz")]
+
+
+def test_progress_amount_on_an_opened_bottle():
+    text = ("08 oz plain water ✔︎ (05 : 40) Bottle #1 32 oz + ¼ pkt electrolytes opened 06 : 45 → "
+            "16 oz down by 07 : 10 → finished by 08 : 00.")
+    daily_log = parse_row("Hydration", text)
+    assert timeline(daily_log) == [("05:40", 40, "oz")]
+    assert daily_log["HydrationOz"] == 40
+
+
+def test_first_amount_before_by_is_kept():
+    text = "Bottle #1 30 oz by 7 : 48 a.m."
+    assert timeline(parse_row("Hydration", text))[0][1:] == (30, "oz")
+
+
+def test_time_range_does_not_split():
+    text = "12 : 30–13 : 00 Lunch: chicken salad"
+    assert len(split_segments(text, tokenize(text))) == 1
+    assert [time for time, _, _ in timeline(parse_row("Meals", text))] == ["12:30"]
+
+
+def test_labels_start_their_segment():
+    text = "Breakfast 06 : 30 oatmeal • Lunch 11 : 45 chicken salad"
+    segments = split_segments(text, drop_running_totals(text, tokenize(text)))
+    assert [(segment.time, text[segment.start:segment.end].strip(" •")) for segment in segments] == [
+        ("06:30", "Breakfast 06 : 30 oatmeal"), ("11:45", "Lunch 11 : 45 chicken salad")]
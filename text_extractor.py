@@ -0,0 +1,58 @@
+import re
+from collections import namedtuple
+
+# Span kinds returned by tokenize()
+TIME = "time"
+RATING = "rating"
+QUANTITY = "quantity"
+FOG = "fog"
+
+Span = namedtuple("Span", ["kind", "start", "end", "value", "unit"])
+
+# One alternation for every token the parsers look for, so a description is
+# scanned once instead of once per helper. Order matters where alternatives
+# could start at the same position: clock times win over quantities, so the
+# "00" of "13 : 00 grilled" is never read as a gram dose.
+_TOKEN_RE = re.compile(r"""
+      (?P<hour>\d{1,2})\s*[:：]\s*(?P<minute>\d{2})        # 22 : 00, 05:24
+    | (?P<rating>\d+)\s*/\s*10                             # 2/10, 2 / 10
+    | (?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>mg|oz|g)        # 400 mg, 32 oz, 1.5 g
+    | fog\s*(?=(?P<fog>\d+))                              # fog 3 (digits left for "fog 2/10")
+""", re.IGNORECASE | re.VERBOSE)
+
+def _number(text):
+    return float(text) if "." in text else int(text)
+
+def tokenize(text):
+    """Tokenize a description once into typed spans"""
+    spans = []
+    
+    for match in _TOKEN_RE.finditer(text):
+        if match.group("hour") is not None:
+            hhmm = f"{int(match.group('hour')):02d}:{int(match.group('minute')):02d}"
+            spans.append(Span(TIME, match.start(), match.end(), hhmm, None))
+        elif match.group("rating") is not None:
+            spans.append(Span(RATING, match.start(), match.end(), int(match.group("rating")), "1-10"))
+        elif match.group("amount") is not None:
+            spans.append(Span(QUANTITY, match.start(), match.end(),
+                              _number(match.group("amount")), match.group("unit").lower()))
+        else:
+            spans.append(Span(FOG, match.start(), match.end(), int(match.group("fog")), "1-10"))
+    
+    return spans
+
+def clock_times(spans):
+    """HH:MM strings of every clock time, in text order"""
+    return [span.value for span in spans if span.kind == TIME]
+
+def first_value(spans, kind, units=None):
+    """First span of a kind (optionally restricted to some units), or None"""
+    for span in spans:
+        if span.kind == kind and (units is None or span.unit in units):
+            return span
+    return None
+
+def values(spans, kind, units=None):
+    """Values of every span of a kind (optionally restricted to some units)"""
+    return [span.value for span in spans
+            if span.kind == kind and (units is None or span.unit in units)]
@@ -0,0 +1,255 @@
+import numpy as np
+
+from event_store import EventStore
+
+# Bucket widths in minutes
+FREQUENCIES = {"H": 60, "D": 1440}
+
+# Candidate triggers, in the order system_prompt.md's trigger analysis lists them
+FEATURES = ("caffeine_mg", "hydration_oz", "sleep_hours", "stress_count", "stress_max",
+            "supplement_count", "meal_count")
+
+TARGETS = ("pain_max", "pain_onset")
+
+# A wake is paired with the last bedtime/asleep note at most this long before it
+MAX_SLEEP_MINUTES = 16 * 60
+
+def _type_rows(store, type, subtypes=None):
+    """Positions of a Type's events (optionally only some Subtypes) in the store"""
+    keep = store.mask(type=type)
+    if subtypes is not None:
+        codes = [store.subtype_names.index(name) for name in subtypes if name in store.subtype_names]
+        keep &= np.isin(store.subtype, codes)
+    return np.flatnonzero(keep)
+
+def sleep_durations(store):
+    """(wake minutes, hours slept) pairing each wake note with the bedtime before it"""
+    minutes = store.time.astype(np.int64)
+    beds = minutes[_type_rows(store, "sleep_note", ("bedtime", "asleep"))]
+    wakes = minutes[_type_rows(store, "sleep_note", ("wake",))]
+
+    # Latest bedtime strictly before each wake, found with one binary search
+    before = np.searchsorted(beds, wakes, side="left") - 1
+    has_bed = before >= 0
+    slept = np.where(has_bed, wakes - beds[np.maximum(before, 0)], -1)
+    keep = (slept > 0) & (slept <= MAX_SLEEP_MINUTES)
+    return wakes[keep], slept[keep] / 60
+
+class FeatureMatrix:
+    """Hourly or daily buckets of trigger features and pain targets.
+
+    Buckets are contiguous from the first to the last logged day, so a lag
+    of k buckets is a shift by k. observed marks buckets that fall on a day
+    with any events; days missing from dataset/ are excluded from every
+    statistic rather than counted as zero intake. Columns are float64 arrays
+    aligned with time. Rolling window sums come from per-column prefix sums
+    that are cached and extended, not recomputed, when days are appended.
+    """
+
+    def __init__(self, freq, start, columns, observed):
+        self.freq = freq
+        self.start = start          # index of the first bucket (minutes // width)
+        self.columns = columns
+        self.observed = observed
+        self._prefix = {}
+
+    @property
+    def width(self):
+        return FREQUENCIES[self.freq]
+
+    def __len__(self):
+        return len(self.observed)
+
+    @property
+    def time(self):
+        """datetime64 start of each bucket"""
+        return ((self.start + np.arange(len(self))) * self.width).astype("datetime64[m]")
+
+    @classmethod
+    def from_store(cls, store, freq="D", pain_threshold=1):
+        """Bucket an EventStore's events into features and targets"""
+        width = FREQUENCIES[freq]
+        minutes = store.time.astype(np.int64)
+        if not len(minutes):
+            return cls(freq, 0, {name: np.zeros(0) for name in FEATURES + TARGETS}, np.zeros(0, dtype=bool))
+
+        # Whole days are covered so hourly buckets of a logged day are all observed
+        first_day, last_day = minutes[0] // 1440, minutes[-1] // 1440
+        start = first_day * 1440 // width
+        size = (last_day + 1) * 1440 // width - start
+        bucket = minutes // width - start
+        value = np.nan_to_num(store.value)
+
+        def total(type):
+            rows = _type_rows(store, type)
+            return np.bincount(bucket[rows], weights=value[rows], minlength=size)
+
+        def count(type):
+            return np.bincount(bucket[_type_rows(store, type)], minlength=size).astype(np.float64)
+
+        def maximum(type):
+            rows = _type_rows(store, type)
+            result = np.zeros(size)
+            np.maximum.at(result, bucket[rows], value[rows])
+            return result
+
+        wakes, hours = sleep_durations(store)
+        sleep = np.bincount(wakes // width - start, weights=hours, minlength=size)
+
+        pain_max = maximum("pain")
+        columns = {
+            "caffeine_mg": total("caffeine"),
+            "hydration_oz": total("hydration"),
+            "sleep_hours": sleep,
+            "stress_count": count("stress"),
+            "stress_max": maximum("stress"),
+            "supplement_count": count("supplement"),
+            "meal_count": count("meal"),
+            "pain_max": pain_max,
+            "pain_onset": (pain_max >= pain_threshold).astype(np.float64),
+        }
+
+        days_logged = np.zeros(size * width // 1440, dtype=bool)
+        days_logged[minutes // 1440 - first_day] = True
+        observed = np.repeat(days_logged, 1440 // width)
+        return cls(freq, start, columns, observed)
+
+    def extend(self, other, since=None):
+        """Splice in a matrix built from newly ingested (or re-ingested) days.
+
+        Buckets from `since` (default: other's first bucket) onward are
+        replaced by other's; cached prefix sums keep their entries before that
+        point and only the new tail is summed. Build other from the new days
+        plus the day before them and pass since=the first new day, so a wake
+        on that day is still paired with the previous night's bedtime.
+        """
+        if other.freq != self.freq:
+            raise ValueError(f"cannot extend a {self.freq} matrix with a {other.freq} matrix")
+        if since is not None and len(other):
+            skip = int(np.datetime64(since, "m").astype(np.int64)) // self.width - other.start
+            if skip > 0:
+                other = FeatureMatrix(other.freq, other.start + skip,
+                                      {name: column[skip:] for name, column in other.columns.items()},
+                                      other.observed[skip:])
+        if not len(other):
+            return self
+        if not len(self):
+            self.start, self.columns, self.observed = other.start, other.columns, other.observed
+            self._prefix = {}
+            return self
+
+        cut = other.start - self.start
+        if cut < 0:
+            raise ValueError("extend() only accepts days at or after the matrix start")
+        gap = max(cut - len(self), 0)
+        keep = min(cut, len(self))
+
+        self.observed = np.concatenate((self.observed[:keep], np.zeros(gap, dtype=bool), other.observed))
+        for name in self.columns:
+            self.columns[name] = np.concatenate((self.columns[name][:keep], np.zeros(gap), other.columns[name]))
+
+        for name, prefix in self._prefix.items():
+            tail = np.concatenate((np.zeros(gap), other.columns[name] * other.observed))
+            self._prefix[name] = np.concatenate((prefix[:keep + 1], prefix[keep] + np.cumsum(tail)))
+        return self
+
+    def prefix(self, name):
+        """Cached prefix sums of an observed column (prefix[i] = sum of buckets < i)"""
+        if name not in self._prefix:
+            self._prefix[name] = np.concatenate(([0.0], np.cumsum(self.columns[name] * self.observed)))
+        return self._prefix[name]
+
+    def rolling(self, name, window):
+        """Sum of a column over the `window` buckets ending at (and including) each bucket"""
+        prefix = self.prefix(name)
+        ends = np.arange(1, len(self) + 1)
+        return prefix[ends] - prefix[np.maximum(ends - window, 0)]
+
+def _lagged_products(a, b, max_lag):
+    """r[..., k] = sum_t a[..., t] * b[t + k] for k = 0..max_lag, for every row of a at once"""
+    n = a.shape[-1]
+    size = 1 << (2 * n - 1).bit_length()
+    spectrum = np.conj(np.fft.rfft(a, size)) * np.fft.rfft(b, size)
+    return np.fft.irfft(spectrum, size)[..., :max_lag + 1]
+
+def lagged_correlations(matrix, target="pain_onset", features=FEATURES, max_lag=3):
+    """Pearson correlation of each feature with the target `lag` buckets later.
+
+    Returns (lags, correlations, pairs): correlations[i, k] relates
+    features[i] at bucket t to the target at t + k over buckets where both
+    are observed, and pairs[k] is how many bucket pairs that used. Every
+    lag and feature is computed in one batch of FFT cross-correlations of
+    masked sums, so the cost is O(features × n log n) whatever max_lag is.
+    """
+    max_lag = min(max_lag, len(matrix) - 1)
+    lags = np.arange(max_lag + 1)
+    if max_lag < 0:
+        return lags, np.zeros((len(features), 0)), np.zeros(0, dtype=np.int64)
+
+    mask = matrix.observed.astype(np.float64)
+    x = np.stack([matrix.columns[name] for name in features]) * mask
+    y = matrix.columns[target] * mask
+
+    pairs = np.rint(_lagged_products(mask, mask, max_lag))
+    sum_x = _lagged_products(x, mask, max_lag)
+    sum_xx = _lagged_products(x * x, mask, max_lag)
+    sum_y = _lagged_products(mask, y, max_lag)
+    sum_yy = _lagged_products(mask, y * y, max_lag)
+    sum_xy = _lagged_products(x, y, max_lag)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = pairs * sum_xy - sum_x * sum_y
+        spread = (pairs * sum_xx - sum_x ** 2) * (pairs * sum_yy - sum_y ** 2)
+        correlations = covariance / np.sqrt(np.where(spread > 1e-9, spread, np.nan))
+    correlations[:, pairs < 3] = np.nan
+    return lags, correlations, pairs.astype(np.int64)
+
+def conditional_pain_rates(matrix, target="pain_onset", features=FEATURES, max_lag=3, thresholds=None):
+    """P(target at t + lag | feature at t above its threshold) against the rate when it is not.
+
+    thresholds maps feature → cut-off (default: > 0, i.e. "any"). Returns a
+    dict of (features × lags) arrays: exposed_rate, unexposed_rate,
+    exposed_pairs and unexposed_pairs, plus "lags".
+    """
+    thresholds = thresholds or {}
+    max_lag = min(max_lag, len(matrix) - 1)
+    mask = matrix.observed.astype(np.float64)
+    exposed = np.stack([matrix.columns[name] > thresholds.get(name, 0) for name in features]) * mask
+    y = (matrix.columns[target] > 0) * mask
+
+    pairs = np.rint(_lagged_products(mask, mask, max_lag))
+    hits = np.rint(_lagged_products(mask, y, max_lag))
+    exposed_pairs = np.rint(_lagged_products(exposed, mask, max_lag))
+    exposed_hits = np.rint(_lagged_products(exposed, y, max_lag))
+    unexposed_pairs = pairs - exposed_pairs
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "lags": np.arange(max_lag + 1),
+            "exposed_rate": exposed_hits / exposed_pairs,
+            "unexposed_rate": (hits - exposed_hits) / unexposed_pairs,
+            "exposed_pairs": exposed_pairs.astype(np.int64),
+            "unexposed_pairs": unexposed_pairs.astype(np.int64),
+        }
+
+def trigger_report(store=None, freq="D", max_lag=3, pain_threshold=1, features=FEATURES):
+    """Rows of {feature, lag, correlation, pairs, exposed_rate, unexposed_rate}, strongest first"""
+    if store is None:
+        store = EventStore.from_dataset()
+    matrix = FeatureMatrix.from_store(store, freq, pain_threshold)
+    lags, correlations, pairs = lagged_correlations(matrix, "pain_onset", features, max_lag)
+    rates = conditional_pain_rates(matrix, "pain_onset", features, max_lag)
+
+    rows = []
+    for i, name in enumerate(features):
+        for k in lags:
+            rows.append({
+                "feature": name,
+                "lag": int(k),
+                "correlation": None if np.isnan(correlations[i, k]) else float(correlations[i, k]),
+                "pairs": int(pairs[k]),
+                "exposed_rate": None if np.isnan(rates["exposed_rate"][i, k]) else float(rates["exposed_rate"][i, k]),
+                "unexposed_rate": None if np.isnan(rates["unexposed_rate"][i, k]) else float(rates["unexposed_rate"][i, k]),
+            })
+    rows.sort(key=lambda row: -abs(row["correlation"]) if row["correlation"] is not None else 0)
+    return rows
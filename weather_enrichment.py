@@ -0,0 +1,177 @@
+import csv
+import os
+
+import numpy as np
+
+from event_store import DATASET_DIR, daily_log_files
+from serialization import dump_file, load_file
+
+WEATHER_CACHE_PATH = ".ingest_cache/weather.npz"
+
+# The nightly wrap (system_prompt.md §2) fills Weather at 22:30
+REFERENCE_TIME = "22:30"
+
+# An observation further than this from the reference time counts as missing
+MAX_GAP_MINUTES = 3 * 60
+
+# Accepted column headers (lower-cased) for each field of an observations file
+COLUMN_ALIASES = {
+    "time": ("time", "timestamp", "datetime", "date_time"),
+    "temp_f": ("temp_f", "tempf", "temperature_f", "temperature"),
+    "pressure": ("pressure", "pressure_hpa", "pressure_mb", "slp"),
+}
+
+def _column_map(header):
+    """Index of each field's column in a header row"""
+    lowered = [str(name).strip().lower() for name in header]
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lowered:
+                columns[field] = lowered.index(alias)
+                break
+        else:
+            raise ValueError(f"no {field} column (expected one of {', '.join(aliases)}) in {header}")
+    return columns
+
+def _to_float(values):
+    return np.array([float(value) if value not in ("", None) else np.nan for value in values])
+
+class WeatherSeries:
+    """Hourly observations as sorted minute timestamps with aligned float arrays.
+
+    Lookups are binary searches over the timestamps, and delta24h (pressure
+    now minus pressure 24 h earlier) is computed for every observation in one
+    vectorized pass, so filling a day is two array reads.
+    """
+
+    def __init__(self, minutes, temp_f, pressure):
+        order = np.argsort(minutes, kind="stable")
+        self.minutes = minutes[order]
+        self.temp_f = temp_f[order]
+        self.pressure = pressure[order]
+        self.delta24h = self.pressure - self._at(self.pressure, self.minutes - 1440)
+
+    def __len__(self):
+        return len(self.minutes)
+
+    @classmethod
+    def from_rows(cls, times, temp_f, pressure):
+        """Build from ISO time strings and numeric columns"""
+        minutes = np.array(times, dtype="datetime64[m]").astype(np.int64)
+        return cls(minutes, _to_float(temp_f), _to_float(pressure))
+
+    @classmethod
+    def from_csv(cls, path):
+        """Load a CSV with time, temp_f and pressure columns (see COLUMN_ALIASES)"""
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            columns = _column_map(next(reader))
+            rows = [row for row in reader if row]
+        return cls.from_rows(*([row[columns[field]] for row in rows] for field in COLUMN_ALIASES))
+
+    @classmethod
+    def from_parquet(cls, path):
+        """Load a Parquet file with time, temp_f and pressure columns (needs pyarrow)"""
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+        columns = _column_map(table.column_names)
+        time = table.column(columns["time"]).to_numpy()
+        if not np.issubdtype(time.dtype, np.datetime64):
+            time = np.array(time, dtype="datetime64[m]")
+        return cls(time.astype("datetime64[m]").astype(np.int64),
+                   table.column(columns["temp_f"]).to_numpy().astype(np.float64),
+                   table.column(columns["pressure"]).to_numpy().astype(np.float64))
+
+    @classmethod
+    def load(cls, path):
+        """Load observations from .csv or .parquet"""
+        if path.endswith(".parquet"):
+            return cls.from_parquet(path)
+        return cls.from_csv(path)
+
+    def save(self, path, source=""):
+        """Write the arrays (and the file they came from) to an .npz cache"""
+        np.savez(path, minutes=self.minutes, temp_f=self.temp_f, pressure=self.pressure,
+                 source=np.array(source))
+
+    @classmethod
+    def from_npz(cls, path, source=None):
+        """Read a cache written by save(); None if it was built from a different source file"""
+        with np.load(path) as data:
+            if source is not None and str(data["source"]) != source:
+                return None
+            return cls(data["minutes"], data["temp_f"], data["pressure"])
+
+    def _at(self, column, minutes):
+        """column sampled at the latest observation at or before each minute (NaN if too old)"""
+        if not len(self.minutes):
+            return np.full(len(minutes), np.nan)
+        index = np.searchsorted(self.minutes, minutes, side="right") - 1
+        found = index >= 0
+        index = np.maximum(index, 0)
+        fresh = found & (minutes - self.minutes[index] <= MAX_GAP_MINUTES)
+        return np.where(fresh, column[index], np.nan)
+
+    def sample(self, minutes):
+        """(temp_f, pressure, delta24h) arrays at each minute"""
+        minutes = np.asarray(minutes, dtype=np.int64)
+        return self._at(self.temp_f, minutes), self._at(self.pressure, minutes), self._at(self.delta24h, minutes)
+
+def open_weather(path, cache_path=WEATHER_CACHE_PATH):
+    """Load observations, reusing the .npz cache while it is newer than the source file"""
+    source = os.path.abspath(path)
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+        series = WeatherSeries.from_npz(cache_path, source)
+        if series is not None:
+            return series
+
+    series = WeatherSeries.load(path)
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    series.save(cache_path, source)
+    return series
+
+def weather_block(temp_f, pressure, delta24h):
+    """Weather dict in the §5 schema; fields without an observation are left out"""
+    block = {}
+    if not np.isnan(temp_f):
+        block["TempF"] = int(round(temp_f))
+    if not np.isnan(pressure):
+        block["Pressure"] = int(round(pressure))
+    if not np.isnan(delta24h):
+        block["Delta24h"] = int(round(delta24h))
+    return block
+
+def enrich_daily_logs(logs, series, reference_time=REFERENCE_TIME, overwrite=False):
+    """Fill each daily log's Weather from the series at reference_time; returns the logs changed"""
+    targets = [daily_log for daily_log in logs if overwrite or not daily_log.get("Weather")]
+    if not targets:
+        return []
+
+    minutes = np.array([f"{daily_log['Date']}T{reference_time}" for daily_log in targets],
+                       dtype="datetime64[m]").astype(np.int64)
+    temp_f, pressure, delta24h = series.sample(minutes)
+
+    changed = []
+    for i, daily_log in enumerate(targets):
+        block = weather_block(temp_f[i], pressure[i], delta24h[i])
+        if block and block != daily_log.get("Weather"):
+            daily_log["Weather"] = block
+            changed.append(daily_log)
+    return changed
+
+def enrich_dataset(weather_path, dataset_dir=DATASET_DIR, reference_time=REFERENCE_TIME,
+                   overwrite=False, pretty=False, cache_path=WEATHER_CACHE_PATH):
+    """Fill Weather in every canonical daily log in dataset/ and rewrite the files that changed"""
+    series = open_weather(weather_path, cache_path) if cache_path else WeatherSeries.load(weather_path)
+    paths = daily_log_files(dataset_dir)
+    logs = [load_file(path) for path in paths]
+    changed = {id(daily_log) for daily_log in enrich_daily_logs(logs, series, reference_time, overwrite)}
+
+    written = []
+    for path, daily_log in zip(paths, logs):
+        if id(daily_log) in changed:
+            dump_file(daily_log, path, pretty=pretty)
+            written.append(path)
+    return written